@@ -2,18 +2,35 @@
 backend_api.py - API for integrating all components
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
-from bait_generator import BaitGenerator
-from chat_engine import ChatEngine
+import os
+from bait_generator import CONSISTENCY_CHECKER
+from core.bait_generator import BaitGenerator
+from core.chat_engine import ChatEngine
+from core.dedup_index import BioDedupIndex
 
 app = FastAPI(title="Personality Cloaking API")
 
 # Initialize components
-bait_generator = BaitGenerator()
-chat_engine = ChatEngine()  # Or load fine-tuned model
+# LLM bios when a key or an OpenAI-compatible endpoint is configured, fallback bios otherwise
+_llm_key, _llm_base = os.getenv("OPENAI_API_KEY"), os.getenv("LLM_API_BASE")
+bait_generator = BaitGenerator(api_key=_llm_key, api_base=_llm_base,
+                               offline=not (_llm_key or _llm_base),
+                               max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+                               cache_path=os.getenv("LLM_CACHE_PATH"))
+# Opt-in: regenerate bios that are near-duplicates of ones already handed out
+if os.getenv("BIO_DEDUP_PATH"):
+    bait_generator.dedup_index = BioDedupIndex(os.getenv("BIO_DEDUP_PATH"))
+# Opt-in: keep pre-generated bios on disk so profile requests don't wait on the LLM
+if os.getenv("BIO_POOL_PATH") and not bait_generator.offline:
+    bait_generator.enable_bio_pool(os.getenv("BIO_POOL_PATH"))
+# Uses the fine-tuned model from fine_tune_chat.py when present, templates otherwise
+chat_engine = ChatEngine(model_path=os.getenv("CHAT_MODEL_PATH", "./personality_chat_model"))
 
 
 class ProfileRequest(BaseModel):
@@ -24,13 +41,31 @@ class ProfileRequest(BaseModel):
 class ChatRequest(BaseModel):
     personality_scores: Dict[str, float]
     message: str
-    chat_history: List[Dict] = []
+    # Deprecated: the server keeps each session's recent turns; send session_id instead
+    chat_history: Optional[List[Dict]] = None
+    session_id: Optional[str] = None  # conversation id; scopes repeat avoidance and context
 
 
 class ProfileResponse(BaseModel):
     profiles: List[Dict[str, Any]]
 
 
+def _api_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The /generate_profiles shape clients already parse (that of the root
+    bait_generator.BaitGenerator): trait, bio, personality_scores, demographics
+    with name/age/location, and consistency_check under the same keyword rule.
+    """
+    demographics = profile["demographics"]
+    return {
+        "trait": profile["trait"],
+        "bio": profile["bio"],
+        "personality_scores": profile["personality_scores"],
+        "demographics": {key: demographics[key] for key in ("name", "age", "location")},
+        "consistency_check": CONSISTENCY_CHECKER.matches(profile["trait"], profile["bio"]),
+    }
+
+
 class ChatResponse(BaseModel):
     response: str
     analyzed_scores: Dict[str, float] = None
@@ -40,16 +75,11 @@ class ChatResponse(BaseModel):
 async def generate_profiles(request: ProfileRequest):
     """Generate fake profiles with specific personality traits."""
     try:
-        if request.count == 1:
-            profile = bait_generator.generate_profile(request.trait)
-            profiles = [profile]
-        else:
-            profiles = []
-            for _ in range(request.count):
-                profile = bait_generator.generate_profile(request.trait)
-                profiles.append(profile)
-
-        return ProfileResponse(profiles=profiles)
+        # Bios are fetched concurrently (bounded by max_concurrency), off the event loop
+        profiles = await run_in_threadpool(bait_generator.generate_profiles,
+                                           request.trait, request.count)
+
+        return ProfileResponse(profiles=[_api_profile(p) for p in profiles])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -58,10 +88,13 @@ async def generate_profiles(request: ProfileRequest):
 async def generate_chat_response(request: ChatRequest):
     """Generate personality-consistent chat response."""
     try:
-        response = chat_engine.generate_chat_response(
+        # Run off the event loop so concurrent requests can share a model batch
+        response = await run_in_threadpool(
+            chat_engine.generate_chat_response,
             personality_scores=request.personality_scores,
             message=request.message,
-            chat_history=request.chat_history
+            chat_history=request.chat_history,
+            session_id=request.session_id
         )
 
         # Optional: Analyze the response's personality
@@ -75,6 +108,63 @@ async def generate_chat_response(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _chat_event_stream(personality_scores: Dict[str, float], message: str,
+                       session_id: Optional[str], chat_history: Optional[List[Dict]] = None):
+    """Server-sent events: one "token" event per chunk, then "done" with the full reply."""
+    pieces = []
+    try:
+        for piece in chat_engine.stream_chat_response(personality_scores, message,
+                                                      chat_history=chat_history,
+                                                      session_id=session_id):
+            pieces.append(piece)
+            yield _sse("token", {"text": piece})
+        response = "".join(pieces).strip()
+        yield _sse("done", {
+            "response": response,
+            "analyzed_scores": chat_engine.analyze_personality_from_text(response),
+        })
+    except Exception as e:
+        yield _sse("error", {"detail": str(e)})
+
+
+def _sse_response(events) -> StreamingResponse:
+    # The sync generator is iterated in the threadpool, off the event loop
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream a personality-consistent reply as server-sent events."""
+    return _sse_response(_chat_event_stream(request.personality_scores, request.message,
+                                            request.session_id, request.chat_history))
+
+
+@app.get("/chat/stream")
+async def chat_stream_get(
+    message: str,
+    session_id: Optional[str] = None,
+    neuroticism: float = Query(0.5, ge=0, le=1),
+    agreeableness: float = Query(0.5, ge=0, le=1),
+    conscientiousness: float = Query(0.5, ge=0, le=1),
+    extraversion: float = Query(0.5, ge=0, le=1),
+    openness: float = Query(0.5, ge=0, le=1),
+):
+    """GET variant for EventSource clients; scores come as query parameters."""
+    scores = {
+        "neuroticism": neuroticism,
+        "agreeableness": agreeableness,
+        "conscientiousness": conscientiousness,
+        "extraversion": extraversion,
+        "openness": openness,
+    }
+    return _sse_response(_chat_event_stream(scores, message, session_id))
+
+
 @app.get("/traits")
 async def get_available_traits():
     """Get list of available personality traits."""
@@ -111,6 +201,74 @@ async def test_chat():
     }
 
 
+@app.get("/sessions/{session_id}/summary")
+async def session_summary(session_id: str):
+    """Running intent counts, escalation stage and recent turns for a conversation."""
+    summary = chat_engine.conversation_summary(session_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session: {session_id}")
+    return summary
+
+
+@app.get("/sessions/{session_id}/personality")
+async def session_personality(session_id: str, sender: str = "scammer"):
+    """Live Big Five estimate for one side of a conversation ("scammer" or "profile")."""
+    estimate = chat_engine.conversation_personality(session_id, sender)
+    if estimate is None:
+        raise HTTPException(status_code=404, detail=f"No estimate for {sender} in {session_id}")
+    return estimate
+
+
+@app.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    """Forget a conversation's state."""
+    return {"session_id": session_id, "ended": chat_engine.end_session(session_id)}
+
+
+@app.get("/metrics/sessions")
+async def session_metrics():
+    """Session store size, evictions and lock contention."""
+    return chat_engine.session_stats()
+
+
+@app.get("/metrics/reply_cache")
+async def reply_cache_metrics():
+    """Model reply cache hit/miss counters and size."""
+    return chat_engine.reply_cache_stats()
+
+
+@app.get("/metrics/llm")
+async def llm_metrics():
+    """LLM client request/error counts, mean latency and prompt cache hit rate."""
+    if bait_generator.llm is None:
+        return {"enabled": False}
+    return {"enabled": True, **bait_generator.llm.stats()}
+
+
+@app.get("/metrics/circuit_breaker")
+async def circuit_breaker_metrics():
+    """LLM circuit state (closed/open/half_open), transition counts and rejected calls."""
+    if bait_generator.breaker is None:
+        return {"enabled": False}
+    return {"enabled": True, **bait_generator.breaker.stats()}
+
+
+@app.get("/metrics/bio_pool")
+async def bio_pool_metrics():
+    """Pre-generated bio pool depth per trait, draw latency and refill rate."""
+    if bait_generator.bio_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **bait_generator.bio_pool.stats()}
+
+
+@app.get("/metrics/bio_dedup")
+async def bio_dedup_metrics():
+    """Near-duplicate bio index lookups, hits and regenerations."""
+    if bait_generator.dedup_index is None:
+        return {"enabled": False}
+    return {"enabled": True, **bait_generator.dedup_index.stats(), **bait_generator.dedup_stats}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -3,12 +3,28 @@ bait_generator.py - CORRECTED version that embodies traits
 """
 
 import json
-import random
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.consistency import ConsistencyChecker
+from core.seeding import make_rng
+
+# Keywords _verify_consistency looks for, compiled once for all generators
+CONSISTENCY_CHECKER = ConsistencyChecker({
+    "high_neuroticism": ["worry", "anxious", "stress", "nervous"],
+    "high_agreeableness": ["help", "kind", "trust", "nice"],
+    "high_extraversion": ["party", "social", "friends", "energy"],
+    "low_conscientiousness": ["spontaneous", "forgot", "oops"],
+    "high_openness": ["art", "creative", "explore", "imagine"]
+}, unknown_passes=False)
 
 
 class BaitGenerator:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        # Seeded generators replay identical demographics
+        self.rng = make_rng(seed, "bait")
+
         # TRAIT-SPECIFIC PROMPTS (EMBODY, NOT DESCRIBE)
         self.TRAIT_PROMPTS = {
             "high_neuroticism": "Write a 2-sentence social media bio AS a person who is anxious, worries constantly, gets stressed easily, and is emotionally sensitive. Speak in first person.",
@@ -91,22 +107,15 @@ class BaitGenerator:
     def _generate_demographics(self) -> Dict:
         """Generate random demographics"""
         return {
-            "name": f"{random.choice(['Emma', 'Liam', 'Olivia', 'Noah'])} {random.choice(['Smith', 'Johnson', 'Williams'])}",
-            "age": random.randint(18, 65),
-            "location": random.choice(["New York", "LA", "Chicago", "Miami"])
+            "name": f"{self.rng.choice(['Emma', 'Liam', 'Olivia', 'Noah'])} {self.rng.choice(['Smith', 'Johnson', 'Williams'])}",
+            "age": self.rng.randint(18, 65),
+            "location": self.rng.choice(["New York", "LA", "Chicago", "Miami"])
         }
 
     def _verify_consistency(self, bio: str, trait: str) -> bool:
         """Verify bio actually reflects the trait"""
-        bio_lower = bio.lower()
-
-        trait_keywords = {
-            "high_neuroticism": ["worry", "anxious", "stress", "nervous"],
-            "high_agreeableness": ["help", "kind", "trust", "nice"],
-            "high_extraversion": ["party", "social", "friends", "energy"],
-            "low_conscientiousness": ["spontaneous", "forgot", "oops"],
-            "high_openness": ["art", "creative", "explore", "imagine"]
-        }
+        return CONSISTENCY_CHECKER.matches(trait, bio)
 
-        keywords = trait_keywords.get(trait, [])
-        return any(keyword in bio_lower for keyword in keywords)
\ No newline at end of file
+    def verify_profiles(self, profiles: List[Dict]) -> Tuple[np.ndarray, Dict]:
+        """Batch _verify_consistency: pass/fail mask plus per-trait pass-rate report"""
+        return CONSISTENCY_CHECKER.verify([p["trait"] for p in profiles], [p["bio"] for p in profiles])
\ No newline at end of file
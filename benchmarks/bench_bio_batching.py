@@ -0,0 +1,66 @@
+"""
+benchmarks/bench_bio_batching.py - One bio per LLM call vs K bios per call
+
+Starts core.fake_llm_server in-process with a fixed per-request latency plus a
+per-completion-token cost, then generates the same batch of profiles with
+BaitGenerator one bio per request and with batch_bios=True (K sized from the
+token budget). Reports requests/s, bios/s and prompt+completion tokens per bio.
+
+Usage: python benchmarks/bench_bio_batching.py [--profiles 500] [--latency-ms 300]
+                                               [--token-ms 0.5] [--concurrency 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bait_generator import TRAIT_SCORE_TEMPLATES, BaitGenerator
+from core.fake_llm_server import create_app, serve_in_thread
+
+
+def run(api_base: str, profiles: int, workers: int, batch: bool, budget: int):
+    generator = BaitGenerator(api_base=api_base, seed=42, max_concurrency=workers,
+                              batch_bios=batch, token_budget=budget)
+    start = time.perf_counter()
+    result = generator.batch_generate_profiles(profiles)
+    elapsed = time.perf_counter() - start
+    stats = generator.llm.stats()
+    generator.llm.close()
+    assert len(result) == profiles
+    live = sum("(#" in p["bio"] for p in result)
+    tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+    k = max(generator.bios_per_request(t) for t in TRAIT_SCORE_TEMPLATES) if batch else 1
+    return {"k": k, "seconds": elapsed, "requests": stats["requests"], "live": live,
+            "prompt_per_bio": stats["prompt_tokens"] / max(live, 1),
+            "tokens_per_bio": tokens / max(live, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[512, 1024, 2048])
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, token_ms=args.token_ms)
+    api_base = serve_in_thread(app) + "/v1"
+
+    print(f"{args.profiles} profiles, {args.concurrency} workers, "
+          f"{args.latency_ms:.0f} ms + {args.token_ms} ms/token per call")
+    print(f"{'mode':>14} {'K':>3} {'seconds':>8} {'requests':>9} {'req/s':>7} {'bios/s':>8} "
+          f"{'prompt tok/bio':>15} {'tokens/bio':>11}")
+    modes = [("one per call", False, 0)] + [(f"budget {b}", True, b) for b in args.budgets]
+    for label, batch, budget in modes:
+        r = run(api_base, args.profiles, args.concurrency, batch, budget or 2048)
+        print(f"{label:>14} {r['k']:>3} {r['seconds']:>8.2f} {r['requests']:>9} "
+              f"{r['requests'] / r['seconds']:>7.1f} {r['live'] / r['seconds']:>8.1f} "
+              f"{r['prompt_per_bio']:>15.1f} {r['tokens_per_bio']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+benchmarks/bench_bio_generation.py - Batch profile generation against a local fake LLM
+
+Starts core.fake_llm_server with injected latency (and optionally errors)
+in-process and times BaitGenerator.batch_generate_profiles at several
+concurrency limits.
+
+Usage: python benchmarks/bench_bio_generation.py [--profiles 200] [--latency-ms 100]
+                                                 [--error-rate 0.05]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bait_generator import BaitGenerator
+from core.fake_llm_server import create_app, serve_in_thread
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, error_rate=args.error_rate)
+    api_base = serve_in_thread(app) + "/v1"
+
+    print(f"{args.profiles} profiles, {args.latency_ms:.0f} ms per LLM call")
+    print(f"{'workers':>7} {'seconds':>8} {'profiles/s':>11} {'in flight':>10} {'LLM errors':>11}")
+    for workers in args.concurrency:
+        app.state.stats["max_in_flight"] = 0
+        generator = BaitGenerator(api_base=api_base, seed=42, max_concurrency=workers)
+        start = time.perf_counter()
+        profiles = generator.batch_generate_profiles(args.profiles)
+        elapsed = time.perf_counter() - start
+        generator.llm.close()
+        assert len(profiles) == args.profiles
+        if not args.error_rate:
+            assert all("(#" in p["bio"] for p in profiles)
+        print(f"{workers:>7} {elapsed:>8.2f} {len(profiles) / elapsed:>11.1f} "
+              f"{app.state.stats['max_in_flight']:>10} {generator.llm.stats()['errors']:>11}")
+
+
+if __name__ == "__main__":
+    main()
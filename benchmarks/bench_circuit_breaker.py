@@ -0,0 +1,57 @@
+"""
+benchmarks/bench_circuit_breaker.py - Profile latency during an LLM outage, with and without the breaker
+
+The outage is simulated with core.fake_llm_server: every request either hangs past
+the client timeout (--mode hang) or fails with HTTP 503 (--mode error).
+
+Usage: python benchmarks/bench_circuit_breaker.py [--mode hang] [--profiles 200]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bait_generator import BaitGenerator
+from core.fake_llm_server import create_app, serve_in_thread
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["hang", "error"], default="hang")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=1.0, help="client timeout, seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.mode == "hang":
+        app = create_app(latency_ms=args.timeout * 1000 * 5)
+    else:
+        app = create_app(latency_ms=50, error_rate=1.0, error_status=503)
+    api_base = serve_in_thread(app) + "/v1"
+
+    print(f"{args.profiles} profiles during an outage ({args.mode}), {args.workers} workers")
+    for use_breaker in (False, True):
+        generator = BaitGenerator(api_base=api_base, timeout=args.timeout, max_retries=1,
+                                  max_concurrency=args.workers)
+        if not use_breaker:
+            generator.breaker = None
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # one fallback message per profile
+            generator.batch_generate_profiles(args.profiles)
+        elapsed = time.perf_counter() - start
+        stats = generator.llm.stats()
+        label = "with breaker" if use_breaker else "no breaker"
+        print(f"{label:<13} {elapsed:>7.2f}s  {elapsed / args.profiles * 1000:>8.1f} ms/profile  "
+              f"LLM requests={stats['requests']}")
+        if use_breaker:
+            print(f"              breaker: {generator.breaker.stats()}")
+        generator.llm.close()
+
+
+if __name__ == "__main__":
+    main()
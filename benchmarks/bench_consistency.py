@@ -0,0 +1,89 @@
+"""
+benchmarks/bench_consistency.py - Per-profile keyword checks vs the batched ConsistencyChecker
+
+Builds n (trait, bio) pairs from the fallback bios plus keyword-free variants,
+checks that the batch mask agrees with the previous per-profile check (keyword
+dict rebuilt on every call) row by row, and times both.
+
+Usage: python benchmarks/bench_consistency.py [--n 1000000] [--loop-n 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core.bait_generator import FALLBACK_BIOS, TRAIT_SCORE_TEMPLATES, BaitGenerator
+from core.consistency import DEFAULT_CHECKER
+
+FILLER = ["Coffee first, then everything else.", "Dog dad. Weekend hiker. Taco critic.",
+          "Living my best life one day at a time."]
+
+
+def old_verify(profile):
+    """verify_profile_consistency before ConsistencyChecker."""
+    bio = profile["bio"].lower()
+    trait_keywords = {
+        "high_neuroticism": ["anxious", "worry", "stress", "nervous", "overthink"],
+        "high_agreeableness": ["kind", "help", "trust", "good", "nice", "polite"],
+        "high_extraversion": ["party", "social", "energy", "friends", "outgoing", "fun"],
+        "low_conscientiousness": ["spontaneous", "moment", "forgot", "plans", "boring"],
+        "high_openness": ["art", "creative", "imagine", "explore", "dream", "consciousness"]
+    }
+    keywords = trait_keywords.get(profile["trait"], [])
+    if keywords:
+        return len([kw for kw in keywords if kw in bio]) > 0
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--loop-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    trait_names = list(TRAIT_SCORE_TEMPLATES)
+    traits = [trait_names[i] for i in rng.integers(0, len(trait_names), args.n)]
+    pick = rng.random(args.n)
+    bios = [f"{FILLER[j % 3]} #{j}" if p < 0.2 else f"{FALLBACK_BIOS[t]} #{j}"
+            for j, (t, p) in enumerate(zip(traits, pick))]
+    profiles = [{"trait": t, "bio": b} for t, b in zip(traits, bios)]
+
+    generator = BaitGenerator(offline=True)
+    loop_n = min(args.n, args.loop_n)
+    start = time.perf_counter()
+    loop_mask = [old_verify(p) for p in profiles[:loop_n]]
+    loop_rate = loop_n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    single_mask = [generator.verify_profile_consistency(p) for p in profiles[:loop_n]]
+    single_rate = loop_n / (time.perf_counter() - start)
+    assert single_mask == loop_mask
+
+    start = time.perf_counter()
+    mask = DEFAULT_CHECKER.check(traits, bios)
+    batch_rate = args.n / (time.perf_counter() - start)
+    assert mask[:loop_n].tolist() == loop_mask
+
+    start = time.perf_counter()
+    mask, report = generator.verify_profiles(profiles)
+    verify_rate = args.n / (time.perf_counter() - start)
+
+    print(f"old per-profile check loop:      {loop_rate:>12,.0f} profiles/s")
+    print(f"verify_profile_consistency loop: {single_rate:>12,.0f} profiles/s  ({single_rate / loop_rate:.1f}x)")
+    print(f"ConsistencyChecker.check:        {batch_rate:>12,.0f} profiles/s  ({batch_rate / loop_rate:.1f}x)")
+    print(f"verify_profiles (mask + report): {verify_rate:>12,.0f} profiles/s")
+    print(f"pass rate {report['pass_rate']:.3f}")
+    for trait, row in report["by_trait"].items():
+        print(f"  {trait:<22} {row['pass_rate']:.3f} of {row['profiles']:,}")
+    for failure in report["top_failures"][:5]:
+        print(f"  {failure['count']:>8,}  {failure['trait']:<22} {failure['pattern']!r}")
+
+
+if __name__ == "__main__":
+    main()
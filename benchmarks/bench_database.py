@@ -0,0 +1,137 @@
+"""
+benchmarks/bench_database.py - Profile inserts/s: per-call connections, persistent WAL, bulk
+
+The "before" path is the previous save_profile (connect, insert, commit, close
+on every call, rollback journal with full fsync). Both run against fresh
+temporary databases, single-threaded and from several threads. Then
+save_profiles_bulk streams a generator of profiles, compared with a
+save_profile loop, and its peak traced memory is measured at two input sizes.
+
+Usage: python benchmarks/bench_database.py [--n 5000] [--threads 4] [--bulk-n 200000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import database_module
+
+PROFILE = {"bio": "Just living life day by day. Enjoying time with friends and family.",
+           "personality": {"openness": 0.5, "conscientiousness": 0.5, "extraversion": 0.5,
+                           "agreeableness": 0.5, "neuroticism": 0.5}}
+
+
+def old_save_profile(profile_data):
+    """save_profile before the connection manager."""
+    try:
+        conn = sqlite3.connect(database_module.DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO profiles (
+                bio,
+                openness,
+                conscientiousness,
+                extraversion,
+                agreeableness,
+                neuroticism
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+            profile_data["bio"],
+            profile_data["personality"]["openness"],
+            profile_data["personality"]["conscientiousness"],
+            profile_data["personality"]["extraversion"],
+            profile_data["personality"]["agreeableness"],
+            profile_data["personality"]["neuroticism"],
+        ))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Database error: {e}")
+        return False
+
+
+def run(save, n: int, threads: int, directory: str, label: str) -> float:
+    database_module.DB_NAME = os.path.join(directory, f"{label}-{threads}.db")
+    database_module.init_db()
+    database_module.close_connections()
+    if save is old_save_profile:
+        # WAL mode sticks to the file; the old path ran on a rollback journal
+        conn = sqlite3.connect(database_module.DB_NAME)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+    start = time.perf_counter()
+    if threads == 1:
+        ok = all(save(PROFILE) for _ in range(n))
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            ok = all(pool.map(lambda _: save(PROFILE), range(n)))
+    elapsed = time.perf_counter() - start
+    database_module.close_connections()
+    rows = sqlite3.connect(database_module.DB_NAME).execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+    assert ok and rows == n, (ok, rows)
+    return n / elapsed
+
+
+def profile_stream(n: int):
+    return (dict(PROFILE, bio=f"{PROFILE['bio']} #{i}") for i in range(n))
+
+
+def fresh_db(directory: str, label: str):
+    database_module.close_connections()
+    database_module.DB_NAME = os.path.join(directory, f"{label}.db")
+    database_module.init_db()
+
+
+def bulk(n: int, directory: str):
+    fresh_db(directory, "loop")
+    start = time.perf_counter()
+    assert all(database_module.save_profile(p) for p in profile_stream(n))
+    loop_rate = n / (time.perf_counter() - start)
+
+    fresh_db(directory, "bulk")
+    start = time.perf_counter()
+    ids = database_module.save_profiles_bulk(profile_stream(n))
+    bulk_rate = n / (time.perf_counter() - start)
+    assert sum(map(len, ids)) == n
+    print(f"save_profile loop {loop_rate:>9,.0f} inserts/s   "
+          f"save_profiles_bulk {bulk_rate:>9,.0f} inserts/s  ({bulk_rate / loop_rate:.1f}x, ids {ids})")
+
+    for size in (n // 10, n):
+        fresh_db(directory, f"mem-{size}")
+        tracemalloc.start()
+        database_module.save_profiles_bulk(profile_stream(size))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  peak traced memory for {size:>9,} profiles: {peak / 1024:>7,.0f} KiB")
+    database_module.close_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--bulk-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in (1, args.threads):
+            old = run(old_save_profile, args.n, threads, directory, "old")
+            new = run(database_module.save_profile, args.n, threads, directory, "new")
+            print(f"{threads} thread(s): connect per call {old:>9,.0f} inserts/s   "
+                  f"persistent WAL {new:>9,.0f} inserts/s  ({new / old:.1f}x)")
+        bulk(args.bulk_n, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+benchmarks/bench_demographics.py - Scalar generate_demographics loop vs columnar sampling
+
+Usage: python benchmarks/bench_demographics.py [--n 1000000] [--loop-n 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core.bait_generator import BaitGenerator
+from core.demographics import sample_demographics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000, help="columnar draws")
+    parser.add_argument("--loop-n", type=int, default=100_000, help="scalar loop draws")
+    args = parser.parse_args()
+
+    generator = BaitGenerator(seed=42, offline=True)
+    start = time.perf_counter()
+    for _ in range(args.loop_n):
+        generator.generate_demographics()
+    loop_rate = args.loop_n / (time.perf_counter() - start)
+
+    rng = np.random.default_rng(42)
+    sample_demographics(1000, rng)  # warm up
+    start = time.perf_counter()
+    batch = sample_demographics(args.n, rng)
+    columnar_rate = args.n / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rows = [batch[i] for i in range(min(args.n, args.loop_n))]
+    dict_rate = len(rows) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    profiles = generator.generate_profiles_columnar(args.n)
+    profile_rate = args.n / (time.perf_counter() - start)
+
+    print(f"generate_demographics loop:   {loop_rate:>14,.0f}/s")
+    print(f"sample_demographics columns:  {columnar_rate:>14,.0f}/s  ({columnar_rate / loop_rate:.0f}x)")
+    print(f"  lazy rows -> dicts:         {dict_rate:>14,.0f}/s")
+    print(f"generate_profiles_columnar:   {profile_rate:>14,.0f}/s  ({len(profiles):,} profiles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+benchmarks/bench_generate.py - Process-pool scaling of core.generate on the fallback path
+
+Generates the same offline workload with 1, 2, 4, ... worker processes (up to
+the CPU count) and reports throughput, speedup and parallel efficiency.
+
+Usage: python benchmarks/bench_generate.py [--count 200000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.generate import generate
+
+
+def main():
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    default_workers = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpus] + [cpus]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    args = parser.parse_args()
+
+    print(f"{args.count:,} offline profiles, {cpus} CPUs available")
+    print(f"{'workers':>7} {'seconds':>8} {'profiles/s':>11} {'speedup':>8} {'efficiency':>11} {'chunk p95 ms':>13}")
+    base = None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as output_dir:
+            summary = generate(args.count, output_dir, workers, seed=42, quiet=True)
+        rate = summary["profiles_per_second"]
+        base = base or rate
+        print(f"{workers:>7} {summary['seconds']:>8.2f} {rate:>11,.0f} {rate / base:>8.2f} "
+              f"{rate / base / workers:>11.0%} {summary['chunk_ms']['p95']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+benchmarks/bench_intent.py - Word-table intent matcher vs. the original substring scans
+
+Usage: python benchmarks/bench_intent.py [-n 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chat_engine import _detect_intent, detect_intents
+from scam_generator import generate_scam
+
+
+def legacy_detect_intent(message: str) -> str:
+    """The pre-regex implementation, kept here as the baseline."""
+    m = message.lower()
+    greetings = ["hi", "hey", "hello", "sup", "yo", "howdy", "hiya", "good morning",
+                 "good evening", "what's up", "whats up"]
+    if any(g in m for g in greetings) and len(m.split()) <= 5:
+        return "greeting"
+    if any(w in m for w in ["money", "transfer", "send", "pay", "cash", "fund",
+                             "account", "dollar", "rupee", "fee", "cost", "price"]):
+        return "money"
+    if any(w in m for w in ["urgent", "immediately", "now", "asap", "hurry",
+                             "quick", "fast", "emergency", "suspended", "hacked"]):
+        return "urgent"
+    if any(w in m for w in ["won", "winner", "prize", "congratulations", "selected",
+                             "reward", "gift", "free", "lucky"]):
+        return "prize"
+    return "default"
+
+
+EXTRA_MESSAGES = [
+    "hi", "hello there", "good morning!", "I know this is odd but hear me out",
+    "Please send the fee today", "This is your final notice", "Are you free later?",
+    "Act now or lose access", "Thanks, talk soon",
+]
+
+
+def build_corpus(n: int, unique: bool, seed: int = 0) -> list:
+    random.seed(seed)
+    pool = [generate_scam() for _ in range(50)] + EXTRA_MESSAGES
+    if unique:
+        # Reference numbers make every message distinct, defeating the batch de-duplication
+        return [f"{random.choice(pool)} Ref #{i}" for i in range(n)]
+    return [random.choice(pool) for _ in range(n)]
+
+
+def timed(label: str, fn, n: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed:8.3f}s  {n / elapsed:>12,.0f} msg/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for unique in (False, True):
+        corpus = build_corpus(args.n, unique)
+        kind = "unique" if unique else "repetitive"
+        print(f"\nClassifying {args.n:,} {kind} messages")
+        legacy = timed("legacy substring scans", lambda: [legacy_detect_intent(m) for m in corpus], args.n)
+        timed("_detect_intent (word table)", lambda: [_detect_intent(m) for m in corpus], args.n)
+        batch = timed("detect_intents (batch)", lambda: detect_intents(corpus), args.n)
+
+        changed = sum(a != b for a, b in zip(legacy, batch))
+        print(f"Classified differently (word-boundary fixes): {changed:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+benchmarks/bench_model_backend.py - Latency and throughput of micro-batched model replies
+
+Runs concurrent clients against ModelReplyBackend at max batch sizes 1, 8 and 32
+and reports p50/p99 latency and replies/sec.
+
+Usage:
+    python benchmarks/bench_model_backend.py --model ./personality_chat_model
+    python benchmarks/bench_model_backend.py --simulate   # no torch needed
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_backend import ModelReplyBackend, build_prompt
+from scam_generator import generate_scam
+
+SCORES = {"neuroticism": 0.92, "agreeableness": 0.45, "conscientiousness": 0.25,
+          "extraversion": 0.35, "openness": 0.50}
+
+
+class SimulatedBackend(ModelReplyBackend):
+    """Stands in for the model: a fixed per-forward-pass cost plus a smaller per-row cost."""
+
+    def __init__(self, *args, pass_ms: float = 40.0, row_ms: float = 2.0, **kwargs):
+        super().__init__("<simulated>", *args, **kwargs)
+        self.pass_ms, self.row_ms = pass_ms, row_ms
+
+    def generate_batch(self, prompts):
+        time.sleep((self.pass_ms + self.row_ms * len(prompts)) / 1000.0)
+        return ["simulated reply"] * len(prompts)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def run(backend, clients: int, requests_per_client: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        local = []
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            backend.generate(SCORES, generate_scam())
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="./personality_chat_model")
+    parser.add_argument("--simulate", action="store_true",
+                        help="use a sleep-based stand-in instead of loading the model")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=8, help="requests per client")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'batch':>5} {'p50 ms':>9} {'p99 ms':>9} {'replies/s':>10} {'mean batch':>11}")
+    for batch_size in (1, 8, 32):
+        if args.simulate:
+            backend = SimulatedBackend(max_batch_size=batch_size, max_wait_ms=args.max_wait_ms)
+        else:
+            backend = ModelReplyBackend(args.model, max_batch_size=batch_size,
+                                        max_wait_ms=args.max_wait_ms)
+            backend.generate_batch([build_prompt(SCORES, "warm up")])  # load outside the timing
+
+        latencies, elapsed = run(backend, args.clients, args.requests)
+        stats = backend.stats()
+        backend.close()
+        print(f"{batch_size:>5} {percentile(latencies, 50) * 1000:>9.1f} "
+              f"{percentile(latencies, 99) * 1000:>9.1f} {len(latencies) / elapsed:>10.1f} "
+              f"{stats['mean_batch_size']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
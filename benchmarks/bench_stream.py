@@ -0,0 +1,123 @@
+"""
+benchmarks/bench_stream.py - Time to first token vs full-reply latency over HTTP
+
+Starts backend_api in-process with uvicorn and compares POST /chat/stream (time to
+the first "token" event and to the "done" event) against POST /generate_chat_response.
+
+Usage:
+    python benchmarks/bench_stream.py                    # whatever backend is configured
+    python benchmarks/bench_stream.py --simulate --token-ms 25
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend_api
+from scam_generator import generate_scam
+
+SCORES = {"neuroticism": 0.92, "agreeableness": 0.45, "conscientiousness": 0.25,
+          "extraversion": 0.35, "openness": 0.50}
+
+
+class SimulatedStreamingBackend:
+    """Stands in for the model: a fixed prefill cost, then one word every token_ms."""
+
+    load_error = None
+
+    def __init__(self, prefill_ms: float = 60.0, token_ms: float = 25.0, words: int = 16):
+        self.prefill, self.per_token = prefill_ms / 1000.0, token_ms / 1000.0
+        self.words = [f"word{i}" for i in range(words)]
+
+    def stream(self, personality_scores, message):
+        time.sleep(self.prefill)
+        for i, word in enumerate(self.words):
+            time.sleep(self.per_token)
+            yield word if i == 0 else " " + word
+
+    def generate(self, personality_scores, message):
+        return "".join(self.stream(personality_scores, message))
+
+    def close(self):
+        pass
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def start_server() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(backend_api.app, host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def time_stream(client: httpx.Client, payload):
+    start = time.perf_counter()
+    first = None
+    with client.stream("POST", "/chat/stream", json=payload) as response:
+        for line in response.iter_lines():
+            if line == "event: token" and first is None:
+                first = time.perf_counter() - start
+            elif line == "event: done":
+                break
+    return first, time.perf_counter() - start
+
+
+def time_blocking(client: httpx.Client, payload):
+    start = time.perf_counter()
+    client.post("/generate_chat_response", json=payload).raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simulate", action="store_true",
+                        help="replace the model backend with a sleep-based token stream")
+    parser.add_argument("--prefill-ms", type=float, default=60.0)
+    parser.add_argument("--token-ms", type=float, default=25.0)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = backend_api.chat_engine
+    if args.simulate:
+        engine.model_backend = SimulatedStreamingBackend(args.prefill_ms, args.token_ms)
+        engine.reply_cache.variety = args.requests + 1  # keep every request a cache miss
+    base_url = start_server()
+
+    ttfb, stream_total, blocking = [], [], []
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        for i in range(args.requests):
+            payload = {"personality_scores": SCORES, "message": generate_scam(),
+                       "session_id": f"bench-{i}"}
+            first, total = time_stream(client, payload)
+            ttfb.append(first)
+            stream_total.append(total)
+            blocking.append(time_blocking(client, payload))
+
+    backend = "simulated" if args.simulate else ("model" if engine.model_backend else "templates")
+    print(f"backend={backend} requests={args.requests}")
+    print(f"{'':<28} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, values in (("/chat/stream first token", ttfb),
+                          ("/chat/stream done", stream_total),
+                          ("/generate_chat_response", blocking)):
+        print(f"{label:<28} {percentile(values, 50) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+benchmarks/workload.py - Seeded baseline workload for comparable throughput numbers
+
+Generates profiles (offline, fallback bios) and replays scam messages against them
+through ChatEngine, all from one seed. The printed digest only changes when the
+generated data changes, so two runs (or two commits) with the same digest did the
+same work and their timings can be compared directly.
+
+Usage: python benchmarks/workload.py [--seed 42] [--profiles 2000] [--messages 20]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.bait_generator import BaitGenerator
+from core.chat_engine import ChatEngine
+from core.seeding import make_rng
+from scam_generator import generate_scam
+
+
+def build_workload(seed: int, n_profiles: int, messages_per_profile: int):
+    bait_gen = BaitGenerator(seed=seed, offline=True)
+    chat = ChatEngine(seed=seed)
+    scam_rng = make_rng(seed, "scams")
+
+    start = time.perf_counter()
+    profiles = bait_gen.batch_generate_profiles(n_profiles)
+    profile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    transcripts = []
+    for i, profile in enumerate(profiles):
+        session = f"bench-{i}"
+        for _ in range(messages_per_profile):
+            message = generate_scam(scam_rng)
+            reply = chat.generate_chat_response(profile["personality_scores"], message,
+                                                session_id=session)
+            transcripts.append((session, message, reply))
+    chat_time = time.perf_counter() - start
+    return profiles, transcripts, profile_time, chat_time
+
+
+def digest(*parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profiles", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20, help="scam messages per profile")
+    args = parser.parse_args()
+
+    profiles, transcripts, profile_time, chat_time = build_workload(
+        args.seed, args.profiles, args.messages)
+    payload = sum(len(json.dumps(p)) for p in profiles) + sum(len(r) for _, _, r in transcripts)
+
+    print(f"seed={args.seed} workload digest={digest(profiles, transcripts)} payload={payload:,} bytes")
+    print(f"profiles: {len(profiles):,} in {profile_time:.3f}s ({len(profiles) / profile_time:,.0f}/s)")
+    print(f"replies:  {len(transcripts):,} in {chat_time:.3f}s ({len(transcripts) / chat_time:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
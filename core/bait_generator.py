@@ -2,65 +2,188 @@
 bait_generator.py - Generates fake profiles with consistent personality traits
 """
 
-import random
 import json
-from typing import Dict, Any
-import openai  # or your LLM API of choice
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+
+from core.bio_pool import DEFAULT_POOL_PATH, BioPool
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.consistency import DEFAULT_CHECKER
+from core.dedup_index import BioDedupIndex
+from core.demographics import (FIRST_NAMES, INTERESTS, INTERESTS_PER_PROFILE, LAST_NAMES,
+                               LOCATIONS, MAX_AGE, MIN_AGE, OCCUPATIONS, ProfileBatch,
+                               sample_demographics)
+from core.llm_client import LLMClient, LLMError, PromptCache, count_message_tokens
+from core.profile_io import FLUSH_EVERY, ProfileWriter
+from core.seeding import make_np_rng, make_rng, resolve_seed
 
 # Configuration
 LLM_MODEL = "gpt-3.5-turbo"  # or "gpt-4" for better quality
+# Batch generation: parallel LLM calls, per-call timeout (s), retries after the first try
+MAX_CONCURRENCY = 8
+REQUEST_TIMEOUT = 30.0
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5
+# New bios to try when one is a near-duplicate of an existing bio
+MAX_REGENERATIONS = 3
+# LLM calls slower than this count against the circuit breaker like failures
+SLOW_CALL_SECONDS = 10.0
+# REQUEST_TIMEOUT and SLOW_CALL_SECONDS are sized for one bio of this many tokens;
+# calls asking for more (multi-bio requests) get both scaled up in proportion
+BIO_MAX_TOKENS = 100
+# Distinct bios the prompt cache collects per prompt before it starts serving them
+CACHE_VARIETY = 20
+# Multi-bio requests (batch_bios=True): K bios per call, with K sized so the prompt
+# plus K bios fits in REQUEST_TOKEN_BUDGET tokens
+REQUEST_TOKEN_BUDGET = 2048
+BIO_TOKENS = 64  # one 2-sentence bio plus its JSON quoting
+MAX_BIOS_PER_REQUEST = 20
+# Parsed bios outside this length are dropped as fragments or run-ons
+MIN_BIO_CHARS = 15
+MAX_BIO_CHARS = 400
+BIO_SYSTEM_PROMPT = "You are writing social media bios from different personality perspectives."
+BATCH_PROMPT_SUFFIX = (
+    "\n\nWrite {k} different bios like that, each distinct in wording and details. "
+    "Return only a JSON array of {k} strings."
+)
+
+# Personality score templates for each trait; ChatEngine also uses them as trait centroids
+TRAIT_SCORE_TEMPLATES = {
+    "high_neuroticism": {
+        "neuroticism": 0.92,
+        "conscientiousness": 0.25,
+        "extraversion": 0.35,
+        "agreeableness": 0.45,
+        "openness": 0.50
+    },
+    "high_agreeableness": {
+        "agreeableness": 0.94,
+        "neuroticism": 0.25,
+        "conscientiousness": 0.70,
+        "extraversion": 0.60,
+        "openness": 0.55
+    },
+    "high_extraversion": {
+        "extraversion": 0.91,
+        "neuroticism": 0.20,
+        "agreeableness": 0.75,
+        "conscientiousness": 0.60,
+        "openness": 0.70
+    },
+    "low_conscientiousness": {
+        "conscientiousness": 0.15,
+        "neuroticism": 0.45,
+        "agreeableness": 0.50,
+        "extraversion": 0.65,
+        "openness": 0.60
+    },
+    "high_openness": {
+        "openness": 0.93,
+        "neuroticism": 0.30,
+        "agreeableness": 0.65,
+        "conscientiousness": 0.55,
+        "extraversion": 0.70
+    },
+    "average": {
+        "neuroticism": 0.50,
+        "agreeableness": 0.50,
+        "conscientiousness": 0.50,
+        "extraversion": 0.50,
+        "openness": 0.50
+    }
+}
+
+# Fallback bios if the LLM is unavailable
+FALLBACK_BIOS = {
+    "high_neuroticism": "I keep overthinking everything... is that normal? Always feeling anxious about what comes next.",
+    "high_agreeableness": "Just here to spread kindness! Always willing to help others and see the good in everyone.",
+    "high_extraversion": "LET'S GOOO! 🎉 Always down for a party or adventure! Hit me up for any social event!",
+    "low_conscientiousness": "Oops forgot to update this... living spontaneously! Plans are boring anyway.",
+    "high_openness": "Exploring consciousness through art and psychedelics. Reality is just one perspective among many.",
+    "average": "Just living life day by day. Enjoying time with friends and family."
+}
+DEFAULT_FALLBACK_BIO = "Normal person living a normal life."
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*\u2022]|\d+[.):])\s*")
+
+
+def parse_bio_list(text: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Bios from a multi-bio completion: the first JSON array in the text, or else one
+    bio per numbered / bulleted line. Entries are unquoted and stripped; empty,
+    too short or too long ones and repeats are dropped. At most limit are returned.
+    """
+    items: List[Any] = []
+    start, end = text.find("["), text.rfind("]")
+    if 0 <= start < end:
+        try:
+            items = json.loads(text[start:end + 1])
+        except ValueError:
+            items = []
+    if not isinstance(items, list) or not items:
+        items = [_LIST_MARKER.sub("", line) for line in text.splitlines()]
+
+    bios, seen = [], set()
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("bio", "")
+        if not isinstance(item, str):
+            continue
+        bio = item.strip().strip("\"'").strip()
+        key = " ".join(bio.lower().split())
+        if not MIN_BIO_CHARS <= len(bio) <= MAX_BIO_CHARS or key in seen:
+            continue
+        seen.add(key)
+        bios.append(bio)
+        if limit is not None and len(bios) >= limit:
+            break
+    return bios
 
 
 class BaitGenerator:
-    def __init__(self, api_key: str = None):
-        if api_key:
-            openai.api_key = api_key
+    def __init__(self, api_key: str = None, seed: Optional[int] = None, offline: bool = False,
+                 api_base: Optional[str] = None, max_concurrency: int = MAX_CONCURRENCY,
+                 timeout: float = REQUEST_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 dedup_index: Optional[BioDedupIndex] = None,
+                 max_regenerations: int = MAX_REGENERATIONS,
+                 llm_client: Optional[LLMClient] = None, cache_path: Optional[str] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, batch_bios: bool = False,
+                 token_budget: int = REQUEST_TOKEN_BUDGET):
+        # Any OpenAI-compatible endpoint, e.g. core/fake_llm_server.py for load tests.
+        # The pool is sized for max_concurrency; cache_path adds an on-disk prompt cache.
+        if llm_client is None and not offline:
+            cache = PromptCache(cache_path, variety=CACHE_VARIETY) if cache_path else None
+            llm_client = LLMClient(api_key=api_key, base_url=api_base, model=LLM_MODEL,
+                                   timeout=timeout, max_connections=max_concurrency, cache=cache)
+        self.llm = llm_client
+        # While the LLM keeps failing or timing out, skip it and serve fallbacks at once
+        self.breaker = circuit_breaker or CircuitBreaker("llm", slow_call_seconds=SLOW_CALL_SECONDS)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # Ask for several bios per call in generate_bios / fresh_bios (see bios_per_request)
+        self.batch_bios = batch_bios
+        self.token_budget = token_budget
+        self._batch_sizes: Dict[str, int] = {}
+        # Seeded generators replay identical demographics and trait picks
+        self.seed = resolve_seed(seed)
+        self.rng = make_rng(seed, "bait")
+        self.np_rng = make_np_rng(seed, "bait-columnar")
+        # Offline skips the LLM and uses FALLBACK_BIOS (deterministic benchmark workloads)
+        self.offline = offline
+        # Pre-generated bios to draw from before calling the LLM (see enable_bio_pool)
+        self.bio_pool: Optional[BioPool] = None
+        # Near-duplicate bios are regenerated; every accepted bio is added to the index
+        self.dedup_index = dedup_index
+        self.max_regenerations = max_regenerations
+        self.dedup_stats = {"duplicates": 0, "regenerated": 0, "kept_duplicates": 0}
 
         # Personality score templates for each trait
-        self.TRAIT_SCORE_TEMPLATES = {
-            "high_neuroticism": {
-                "neuroticism": 0.92,
-                "conscientiousness": 0.25,
-                "extraversion": 0.35,
-                "agreeableness": 0.45,
-                "openness": 0.50
-            },
-            "high_agreeableness": {
-                "agreeableness": 0.94,
-                "neuroticism": 0.25,
-                "conscientiousness": 0.70,
-                "extraversion": 0.60,
-                "openness": 0.55
-            },
-            "high_extraversion": {
-                "extraversion": 0.91,
-                "neuroticism": 0.20,
-                "agreeableness": 0.75,
-                "conscientiousness": 0.60,
-                "openness": 0.70
-            },
-            "low_conscientiousness": {
-                "conscientiousness": 0.15,
-                "neuroticism": 0.45,
-                "agreeableness": 0.50,
-                "extraversion": 0.65,
-                "openness": 0.60
-            },
-            "high_openness": {
-                "openness": 0.93,
-                "neuroticism": 0.30,
-                "agreeableness": 0.65,
-                "conscientiousness": 0.55,
-                "extraversion": 0.70
-            },
-            "average": {
-                "neuroticism": 0.50,
-                "agreeableness": 0.50,
-                "conscientiousness": 0.50,
-                "extraversion": 0.50,
-                "openness": 0.50
-            }
-        }
+        self.TRAIT_SCORE_TEMPLATES = TRAIT_SCORE_TEMPLATES
 
         # Trait-specific bio generation prompts
         self.TRAIT_PROMPTS = {
@@ -96,33 +219,152 @@ class BaitGenerator:
 
     def generate_bio(self, trait: str) -> str:
         """Generate a bio that embodies (not describes) the personality trait."""
-        prompt = self.TRAIT_PROMPTS.get(trait, self.TRAIT_PROMPTS["average"])
+        if self.offline:
+            return FALLBACK_BIOS.get(trait, DEFAULT_FALLBACK_BIO)
+        if self.bio_pool is not None:
+            bio = self.bio_pool.draw(trait)
+            if bio:
+                return bio
 
         try:
-            # Using OpenAI API (you can replace with your preferred LLM)
-            response = openai.ChatCompletion.create(
-                model=LLM_MODEL,
-                messages=[
-                    {"role": "system",
-                     "content": "You are writing social media bios from different personality perspectives."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=100,
-                temperature=0.8
-            )
-            bio = response.choices[0].message.content.strip()
-            return bio
+            return self._llm_bio(trait)
+        except CircuitOpenError:
+            return FALLBACK_BIOS.get(trait, DEFAULT_FALLBACK_BIO)
         except Exception as e:
             # Fallback bios if API fails
-            fallback_bios = {
-                "high_neuroticism": "I keep overthinking everything... is that normal? Always feeling anxious about what comes next.",
-                "high_agreeableness": "Just here to spread kindness! Always willing to help others and see the good in everyone.",
-                "high_extraversion": "LET'S GOOO! 🎉 Always down for a party or adventure! Hit me up for any social event!",
-                "low_conscientiousness": "Oops forgot to update this... living spontaneously! Plans are boring anyway.",
-                "high_openness": "Exploring consciousness through art and psychedelics. Reality is just one perspective among many.",
-                "average": "Just living life day by day. Enjoying time with friends and family."
-            }
-            return fallback_bios.get(trait, "Normal person living a normal life.")
+            print(f"Bio generation failed for {trait}, using fallback: {e}")
+            return FALLBACK_BIOS.get(trait, DEFAULT_FALLBACK_BIO)
+
+    def _llm_bio(self, trait: str) -> str:
+        return self._complete(self._trait_prompt(trait))
+
+    def _trait_prompt(self, trait: str) -> str:
+        return self.TRAIT_PROMPTS.get(trait, self.TRAIT_PROMPTS["average"])
+
+    def bios_per_request(self, trait: str) -> int:
+        """
+        Bios to ask for in one call: what fits in token_budget after the prompt at
+        BIO_TOKENS each, capped at MAX_BIOS_PER_REQUEST. Computed once per trait.
+        """
+        if trait not in self._batch_sizes:
+            k = MAX_BIOS_PER_REQUEST
+            prompt = self._trait_prompt(trait) + BATCH_PROMPT_SUFFIX.format(k=k)
+            prompt_tokens = count_message_tokens(self._messages(prompt), LLM_MODEL)
+            fits = (self.token_budget - prompt_tokens) // BIO_TOKENS
+            self._batch_sizes[trait] = max(1, min(MAX_BIOS_PER_REQUEST, fits))
+        return self._batch_sizes[trait]
+
+    def _llm_bios(self, trait: str, k: int) -> List[str]:
+        """Up to k distinct bios from one call; fewer if the reply has bad or repeated entries."""
+        prompt = self._trait_prompt(trait) + BATCH_PROMPT_SUFFIX.format(k=k)
+        return parse_bio_list(self._complete(prompt, max_tokens=k * BIO_TOKENS + 16), k)
+
+    def batch_bios_for(self, wanted: Dict[str, int],
+                       max_concurrency: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Up to wanted[trait] LLM bios per trait, in ceil(n / K) multi-bio calls per
+        trait run concurrently. Short replies are not topped up; failed calls are left out.
+        """
+        calls = []
+        for trait, n in wanted.items():
+            k = self.bios_per_request(trait)
+            calls += [(trait, k)] * (n // k) + ([(trait, n % k)] if n % k else [])
+
+        def one(call):
+            trait, size = call
+            try:
+                return self._llm_bios(trait, size)
+            except CircuitOpenError:
+                return []
+            except Exception as e:
+                print(f"Bio generation failed for {trait}: {e}")
+                return []
+
+        bios: Dict[str, List[str]] = {trait: [] for trait in wanted}
+        if not calls:
+            return bios
+        with ThreadPoolExecutor(max_workers=min(max_concurrency or self.max_concurrency, len(calls)),
+                                thread_name_prefix="bio") as pool:
+            for (trait, _), batch in zip(calls, pool.map(one, calls)):
+                bios[trait] += batch
+        return bios
+
+    def fresh_bios(self, trait: str, n: int) -> List[str]:
+        """n live LLM bios for one trait, fetched concurrently; failed calls are left out."""
+        if self.batch_bios:
+            return self.batch_bios_for({trait: n})[trait]
+
+        def one(_):
+            try:
+                return self._llm_bio(trait)
+            except CircuitOpenError:
+                return None
+            except Exception as e:
+                print(f"Bio generation failed for {trait}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, n)),
+                                thread_name_prefix="bio") as pool:
+            return [bio for bio in pool.map(one, range(n)) if bio]
+
+    def enable_bio_pool(self, path: str = DEFAULT_POOL_PATH, start: bool = True,
+                        **pool_kwargs) -> BioPool:
+        """Serve bios from a persistent pre-generated pool, refilled in the background."""
+        self.bio_pool = BioPool(self.fresh_bios, self.TRAIT_SCORE_TEMPLATES, path, **pool_kwargs)
+        if start:
+            self.bio_pool.start()
+        return self.bio_pool
+
+    @staticmethod
+    def _messages(prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": BIO_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _complete(self, prompt: str, max_tokens: int = BIO_MAX_TOKENS) -> str:
+        """
+        One chat completion through the circuit breaker; transient errors are retried
+        with exponential backoff. Raises CircuitOpenError without calling while open.
+        Calls for more than BIO_MAX_TOKENS get a proportionally longer timeout and
+        slow-call threshold, so a healthy multi-bio call isn't counted as slow.
+        """
+        messages = self._messages(prompt)
+        kwargs: Dict[str, Any] = {"max_tokens": max_tokens, "temperature": 0.8}
+        scale = max(1.0, max_tokens / BIO_MAX_TOKENS)
+        if scale > 1.0:
+            kwargs["timeout"] = self.timeout * scale
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.breaker is None:
+                    return self.llm.complete(messages, **kwargs)
+                slow = self.breaker.slow_call_seconds
+                return self.breaker.call_within(None if slow is None else slow * scale,
+                                                self.llm.complete, messages, **kwargs)
+            except LLMError as e:
+                # Auth and bad-request errors fall back at once
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def generate_bios(self, traits: List[str], max_concurrency: Optional[int] = None) -> List[str]:
+        """Bios for many traits, with at most max_concurrency LLM calls in flight; keeps input order."""
+        workers = min(max_concurrency or self.max_concurrency, len(traits))
+        if self.batch_bios and not self.offline and self.bio_pool is None:
+            return self._generate_bios_batched(traits, workers)
+        if self.offline or workers <= 1:
+            return [self.generate_bio(trait) for trait in traits]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bio") as pool:
+            return list(pool.map(self.generate_bio, traits))
+
+    def _generate_bios_batched(self, traits: List[str], max_concurrency: int) -> List[str]:
+        """generate_bios with multi-bio calls per trait; positions left short get fallbacks."""
+        wanted: Dict[str, int] = {}
+        for trait in traits:
+            wanted[trait] = wanted.get(trait, 0) + 1
+        fetched = {trait: iter(bios) for trait, bios in self.batch_bios_for(wanted, max_concurrency).items()}
+        return [next(fetched[trait], None) or FALLBACK_BIOS.get(trait, DEFAULT_FALLBACK_BIO)
+                for trait in traits]
 
     def get_personality_scores(self, trait: str) -> Dict[str, float]:
         """Get predefined personality scores for the given trait."""
@@ -130,27 +372,34 @@ class BaitGenerator:
 
     def generate_demographics(self) -> Dict[str, Any]:
         """Generate random demographic information."""
-        first_names = ["Emma", "Liam", "Olivia", "Noah", "Ava", "Oliver", "Sophia", "Elijah", "Isabella", "Lucas"]
-        last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
-                      "Martinez"]
-
-        age = random.randint(18, 65)
-        interests = random.sample([
-            "reading", "gaming", "hiking", "cooking", "photography",
-            "music", "travel", "yoga", "movies", "technology"
-        ], 3)
+        age = self.rng.randint(MIN_AGE, MAX_AGE)
+        interests = self.rng.sample(INTERESTS, INTERESTS_PER_PROFILE)
 
         return {
-            "name": f"{random.choice(first_names)} {random.choice(last_names)}",
+            "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
             "age": age,
             "interests": interests,
-            "location": random.choice(["New York", "Los Angeles", "Chicago", "Miami", "Austin"]),
-            "occupation": random.choice([
-                "Marketing Specialist", "Software Developer", "Teacher",
-                "Nurse", "Graphic Designer", "Sales Representative"
-            ])
+            "location": self.rng.choice(LOCATIONS),
+            "occupation": self.rng.choice(OCCUPATIONS)
         }
 
+    def generate_profiles_columnar(self, n: int,
+                                   rng: Optional[np.random.Generator] = None) -> ProfileBatch:
+        """
+        n random-trait profiles drawn in one vectorized pass, for offline population
+        studies: fallback bios, template scores, sample_demographics columns.
+        Rows become dicts only when read (same shape as generate_profile).
+        """
+        rng = rng or self.np_rng
+        traits = list(self.TRAIT_SCORE_TEMPLATES)
+        return ProfileBatch(
+            trait=rng.integers(0, len(traits), size=n, dtype=np.uint8),
+            trait_names=traits,
+            bios=[FALLBACK_BIOS.get(t, DEFAULT_FALLBACK_BIO) for t in traits],
+            scores=[self.TRAIT_SCORE_TEMPLATES[t] for t in traits],
+            demographics=sample_demographics(n, rng),
+        )
+
     def generate_profile(self, trait: str) -> Dict[str, Any]:
         """
         Generate a complete fake profile with consistent personality.
@@ -165,66 +414,116 @@ class BaitGenerator:
         """
         # Generate bio that embodies the trait
         bio = self.generate_bio(trait)
+        return self._assemble_profile(trait, bio, self.generate_demographics())
 
-        # Get personality scores for this trait
-        scores = self.get_personality_scores(trait)
-
-        # Generate demographics
-        demographics = self.generate_demographics()
+    def _unique_bio(self, trait: str, bio: str) -> str:
+        """Swap a near-duplicate bio for a fresh one, up to max_regenerations times."""
+        if self.dedup_index is None:
+            return bio
+        for attempt in range(self.max_regenerations + 1):
+            if self.dedup_index.check_and_add(bio) is None:
+                return bio
+            self.dedup_stats["duplicates"] += 1
+            # Offline bios are fixed per trait, so asking again can't help
+            if self.offline or attempt == self.max_regenerations:
+                break
+            self.dedup_stats["regenerated"] += 1
+            bio = self.generate_bio(trait)
+        self.dedup_stats["kept_duplicates"] += 1
+        return bio
 
+    def _assemble_profile(self, trait: str, bio: str, demographics: Dict[str, Any]) -> Dict[str, Any]:
         # Create complete profile
-        profile = {
+        return {
             "trait": trait,
-            "bio": bio,
-            "personality_scores": scores,
+            "bio": self._unique_bio(trait, bio),
+            "personality_scores": self.get_personality_scores(trait),
             "demographics": demographics,
             "creation_date": "2024-03-15"  # You can make this dynamic
         }
 
-        return profile
-
-    def batch_generate_profiles(self, n: int = 10) -> list:
-        """Generate multiple profiles with random traits."""
-        traits = list(self.TRAIT_SCORE_TEMPLATES.keys())
-        profiles = []
+    def generate_profiles(self, trait: str, count: int,
+                          max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """count profiles for one trait, bios fetched concurrently."""
+        demographics = [self.generate_demographics() for _ in range(count)]
+        bios = self.generate_bios([trait] * count, max_concurrency)
+        return [self._assemble_profile(trait, b, d) for b, d in zip(bios, demographics)]
 
+    def batch_generate_profiles(self, n: int = 10, max_concurrency: Optional[int] = None,
+                                trait_mix: Optional[Dict[str, float]] = None) -> list:
+        """
+        Generate multiple profiles with random traits, uniform over all traits or
+        weighted by trait_mix (trait -> relative weight).
+        """
+        traits = list(trait_mix or self.TRAIT_SCORE_TEMPLATES.keys())
+        weights = list(trait_mix.values()) if trait_mix else None
+        picks, demographics = [], []
+        # Draw in the same order as the one-at-a-time loop so seeded runs match it
         for _ in range(n):
-            trait = random.choice(traits)
-            profile = self.generate_profile(trait)
-            profiles.append(profile)
-
-        return profiles
+            picks.append(self.rng.choices(traits, weights)[0] if weights else self.rng.choice(traits))
+            demographics.append(self.generate_demographics())
+        bios = self.generate_bios(picks, max_concurrency)
+        return [self._assemble_profile(t, b, d) for t, b, d in zip(picks, bios, demographics)]
 
-    def save_profiles(self, profiles: list, filename: str = "generated_profiles.json"):
-        """Save generated profiles to JSON file."""
+    def save_profiles(self, profiles: Iterable[Dict[str, Any]],
+                      filename: str = "generated_profiles.json", resume: bool = False) -> int:
+        """
+        Save generated profiles. A .jsonl path (optionally .jsonl.gz / .jsonl.zst) is
+        streamed one profile per line with checkpoints (core.profile_io); with resume,
+        the first profiles already on disk are skipped. Other paths get one JSON array.
+        """
+        if ".jsonl" in filename:
+            with ProfileWriter(filename, resume=resume) as writer:
+                skip = writer.records if resume else 0
+                count = writer.write_many(islice(profiles, skip, None))
+            print(f"Saved {count} profiles to {filename} ({writer.records} in file)")
+            return count
+        profiles = list(profiles)
         with open(filename, 'w') as f:
             json.dump(profiles, f, indent=2)
         print(f"Saved {len(profiles)} profiles to {filename}")
+        return len(profiles)
+
+    def generate_profiles_to_file(self, n: int, filename: str, resume: bool = True,
+                                  flush_every: int = FLUSH_EVERY,
+                                  trait_mix: Optional[Dict[str, float]] = None) -> int:
+        """
+        Generate n random-trait profiles straight into a JSONL file, flush_every at a
+        time, so memory stays flat. A rerun after a crash picks up from the last
+        checkpoint and only generates what is missing. Returns the records in the file.
+        """
+        with ProfileWriter(filename, flush_every=flush_every, resume=resume) as writer:
+            while writer.records < n:
+                # Seeded chunks depend on where they start, so a resumed run carries on
+                # instead of replaying the first chunk's draws
+                self.reseed("chunk", writer.records)
+                writer.write_many(self.batch_generate_profiles(min(flush_every, n - writer.records),
+                                                               trait_mix=trait_mix))
+                writer.flush()
+        return writer.records
+
+    def reseed(self, *labels):
+        """Restart the seeded random streams at a point named by labels; no-op when unseeded."""
+        if self.seed is not None:
+            self.rng = make_rng(self.seed, "bait", *labels)
+            self.np_rng = make_np_rng(self.seed, "bait-columnar", *labels)
 
     def verify_profile_consistency(self, profile: Dict[str, Any]) -> bool:
         """
         Verify that the bio actually reflects the claimed personality trait.
         This is a simplified version - you should implement actual NLP analysis.
         """
-        trait = profile["trait"]
-        bio = profile["bio"].lower()
-
-        # Simple keyword verification (you should use your ML model here)
-        trait_keywords = {
-            "high_neuroticism": ["anxious", "worry", "stress", "nervous", "overthink"],
-            "high_agreeableness": ["kind", "help", "trust", "good", "nice", "polite"],
-            "high_extraversion": ["party", "social", "energy", "friends", "outgoing", "fun"],
-            "low_conscientiousness": ["spontaneous", "moment", "forgot", "plans", "boring"],
-            "high_openness": ["art", "creative", "imagine", "explore", "dream", "consciousness"]
-        }
+        # Simple keyword verification (you should use your ML model here);
+        # "average" has no keywords and always passes
+        return DEFAULT_CHECKER.matches(profile["trait"], profile["bio"])
 
-        keywords = trait_keywords.get(trait, [])
-        if keywords:
-            # Check if any keywords appear in bio
-            matches = [kw for kw in keywords if kw in bio]
-            return len(matches) > 0
-
-        return True  # For "average" trait
+    def verify_profiles(self, profiles: List[Dict[str, Any]]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        verify_profile_consistency for a whole batch in one pass: a pass/fail mask
+        aligned with profiles and a report with pass rates per trait and the most
+        common failing bio patterns (see core.consistency).
+        """
+        return DEFAULT_CHECKER.verify([p["trait"] for p in profiles], [p["bio"] for p in profiles])
 
 
 # Example usage
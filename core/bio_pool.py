@@ -0,0 +1,162 @@
+"""
+core/bio_pool.py - Persistent per-trait pool of pre-generated bios with background refill
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+DEFAULT_POOL_PATH = "bio_pool.db"
+LOW_WATER = 20
+HIGH_WATER = 100
+REFILL_BATCH = 16
+# Seconds the worker sleeps between checks when nobody wakes it
+POLL_INTERVAL = 5.0
+
+
+class BioPool:
+    """
+    SQLite-backed FIFO of ready-made bios per trait.
+
+    draw() pops the oldest bio for a trait (or returns None when that pool is
+    empty); a background worker tops every trait back up to high_water once it
+    falls below low_water, calling fill_fn(trait, n) for at most refill_batch bios
+    at a time. fill_fn should leave out failed generations rather than return
+    placeholder text, so the pool only ever holds real bios.
+    """
+
+    def __init__(self, fill_fn: Callable[[str, int], List[str]], traits: Iterable[str],
+                 path: str = DEFAULT_POOL_PATH, low_water: int = LOW_WATER,
+                 high_water: int = HIGH_WATER, refill_batch: int = REFILL_BATCH,
+                 poll_interval: float = POLL_INTERVAL):
+        if not 0 <= low_water < high_water:
+            raise ValueError("Need 0 <= low_water < high_water")
+        self.fill_fn = fill_fn
+        self.traits = list(traits)
+        self.low_water = low_water
+        self.high_water = high_water
+        self.refill_batch = refill_batch
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # A lost or repeated bio after a crash is harmless; don't fsync every draw
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bio_pool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trait TEXT NOT NULL,
+                bio TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bio_pool_trait ON bio_pool (trait, id)")
+        self._conn.commit()
+        # Depth is tracked in memory so draws never need a COUNT(*)
+        self._depth: Dict[str, int] = {t: 0 for t in self.traits}
+        for trait, count in self._conn.execute("SELECT trait, COUNT(*) FROM bio_pool GROUP BY trait"):
+            self._depth[trait] = count
+
+        self._counters = {"draws": 0, "empty_draws": 0, "refilled": 0, "refill_errors": 0}
+        self._draw_seconds = 0.0
+        self._draw_latencies: deque = deque(maxlen=1024)
+        self._refill_seconds = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def draw(self, trait: str) -> Optional[str]:
+        start = time.perf_counter()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, bio FROM bio_pool WHERE trait = ? ORDER BY id LIMIT 1", (trait,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM bio_pool WHERE id = ?", (row[0],))
+                self._conn.commit()
+                self._depth[trait] -= 1
+            depth = self._depth.get(trait, 0)
+            elapsed = time.perf_counter() - start
+            self._counters["draws"] += 1
+            self._counters["empty_draws"] += row is None
+            self._draw_seconds += elapsed
+            self._draw_latencies.append(elapsed)
+        if depth < self.low_water:
+            self._wake.set()
+        return row[1] if row is not None else None
+
+    def depth(self, trait: str) -> int:
+        return self._depth.get(trait, 0)
+
+    def refill_once(self) -> int:
+        """Top up every trait below low_water to high_water; returns bios added."""
+        added = 0
+        for trait in self.traits:
+            if self.depth(trait) >= self.low_water:
+                continue
+            while not self._stop.is_set() and self.depth(trait) < self.high_water:
+                n = min(self.refill_batch, self.high_water - self.depth(trait))
+                start = time.perf_counter()
+                try:
+                    bios = [b for b in self.fill_fn(trait, n) if b]
+                except Exception as e:
+                    print(f"Bio pool refill failed for {trait}: {e}")
+                    bios = []
+                    self._counters["refill_errors"] += 1
+                if bios:
+                    self._insert(trait, bios)
+                self._refill_seconds += time.perf_counter() - start
+                added += len(bios)
+                if len(bios) < n:
+                    break  # generator is failing; try again on the next round
+        return added
+
+    def _insert(self, trait: str, bios: List[str]):
+        with self._lock:
+            self._conn.executemany("INSERT INTO bio_pool (trait, bio) VALUES (?, ?)",
+                                   [(trait, bio) for bio in bios])
+            self._conn.commit()
+            self._depth[trait] = self._depth.get(trait, 0) + len(bios)
+            self._counters["refilled"] += len(bios)
+
+    def start(self) -> "BioPool":
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._wake.set()  # fill on startup
+            self._worker = threading.Thread(target=self._run, name="bio-pool-refill", daemon=True)
+            self._worker.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.refill_once()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=10)
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            stats: Dict[str, object] = dict(self._counters)
+            latencies = sorted(self._draw_latencies)
+            draws = self._counters["draws"]
+            stats["depth"] = dict(self._depth)
+            stats["draw_ms_mean"] = self._draw_seconds / draws * 1000 if draws else 0.0
+            stats["draw_ms_p99"] = latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0
+            stats["refill_per_sec"] = (self._counters["refilled"] / self._refill_seconds
+                                       if self._refill_seconds else 0.0)
+        stats["low_water"], stats["high_water"] = self.low_water, self.high_water
+        return stats
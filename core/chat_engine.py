@@ -2,8 +2,21 @@
 core/chat_engine.py - Context-aware, varied personality responses
 """
 
-import random
-from typing import Dict, List, Optional
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from core.bait_generator import TRAIT_SCORE_TEMPLATES
+from core.intent_classifier import DEFAULT_MODEL_PATH as DEFAULT_INTENT_MODEL_PATH
+from core.intent_classifier import GREETING_MAX_WORDS, IntentClassifier
+from core.model_backend import ModelReplyBackend
+from core.models import BIG_FIVE, ConversationState
+from core.personality_analyzer import IncrementalEstimator, PersonalityAnalyzer
+from core.response_cache import ReplyCache
+from core.seeding import make_np_rng, make_rng
+from core.session_store import SessionStore
 
 
 # Per-trait response pools keyed by message intent
@@ -135,94 +148,414 @@ _RESPONSES = {
     },
 }
 
-# Trait score → pool key mapping
-_TRAIT_MAP = [
-    ("high_neuroticism",     lambda s: s.get("neuroticism", 0) > 0.7),
-    ("high_agreeableness",   lambda s: s.get("agreeableness", 0) > 0.7),
-    ("high_extraversion",    lambda s: s.get("extraversion", 0) > 0.7),
-    ("low_conscientiousness",lambda s: s.get("conscientiousness", 0) < 0.3),
-    ("high_openness",        lambda s: s.get("openness", 0) > 0.7),
-]
+# Intent keywords, checked in priority order (greeting only wins for short messages)
+_INTENT_KEYWORDS = {
+    "greeting": ["hi", "hey", "hello", "sup", "yo", "howdy", "hiya", "good morning",
+                 "good evening", "what's up", "whats up"],
+    "money":    ["money", "transfer", "transferring", "send", "pay", "cash", "fund",
+                 "account", "dollar", "rupee", "fee", "cost", "price"],
+    "urgent":   ["urgent", "immediately", "now", "asap", "hurry",
+                 "quick", "fast", "emergency", "suspended", "hacked"],
+    "prize":    ["won", "winner", "prize", "congratulations", "selected",
+                 "reward", "gift", "free", "lucky"],
+}
+_INTENT_PRIORITY = ("money", "urgent", "prize")
+_GREETING_MAX_WORDS = GREETING_MAX_WORDS
 
+# Common inflections accepted after non-greeting keywords ("funds", "payment", "sending")
+_INFLECTIONS = ("", "s", "es", "ed", "ing", "ment", "ments")
 
-def _detect_intent(message: str) -> str:
-    """Classify the incoming message into a rough intent bucket."""
-    m = message.lower()
-    greetings = ["hi", "hey", "hello", "sup", "yo", "howdy", "hiya", "good morning",
-                 "good evening", "what's up", "whats up"]
-    if any(g in m for g in greetings) and len(m.split()) <= 5:
+def _fold_table() -> bytes:
+    """bytes.translate table: ASCII letters to lower case, other ASCII non-word bytes to spaces."""
+    table = bytearray(range(256))
+    for b in range(128):
+        ch = chr(b)
+        if ch.isupper():
+            table[b] = ord(ch.lower())
+        elif not (ch.isalnum() or ch == "_"):
+            table[b] = ord(" ")
+    return bytes(table)
+
+
+_FOLD = _fold_table()
+
+
+def _words(message: str) -> List[bytes]:
+    """
+    Lower-cased words of the message, split at punctuation and whitespace, with
+    apostrophes dropped ("won't" -> "wont", "what's" -> "whats"). One encode, one
+    C-level translate and one split, so no per-character Python or regex work.
+    Non-ASCII bytes stay inside their word, so "cashé" is not "cash".
+    """
+    return message.encode("utf-8").translate(_FOLD, b"'").split()
+
+
+def _compile_intent_words():
+    """
+    Expand the keyword lists (plus inflections) into a folded word -> intent table,
+    so a message is matched against every intent with one set intersection and
+    "now" no longer fires on "know". Multi-word greetings are kept as word tuples.
+    """
+    table, phrases = {}, set()
+    for intent, keywords in _INTENT_KEYWORDS.items():
+        suffixes = ("",) if intent == "greeting" else _INFLECTIONS
+        for keyword in keywords:
+            for suffix in suffixes:
+                words = tuple(_words(keyword + suffix))
+                if len(words) == 1:
+                    table.setdefault(words[0], intent)
+                else:
+                    phrases.add(words)
+    return table, frozenset(phrases), frozenset(words[0] for words in phrases)
+
+
+_INTENT_WORDS, _GREETING_PHRASES, _GREETING_PHRASE_STARTS = _compile_intent_words()
+
+
+def _match_intents(message: str) -> set:
+    """Return every intent whose keywords appear in the message."""
+    words = _words(message)
+    found = {_INTENT_WORDS[w] for w in _INTENT_WORDS.keys() & words}
+    if ("greeting" not in found and not _GREETING_PHRASE_STARTS.isdisjoint(words)
+            and not _GREETING_PHRASES.isdisjoint(zip(words, words[1:]))):
+        found.add("greeting")
+    return found
+
+
+def _resolve_intent(found: set, message: str) -> str:
+    if "greeting" in found and len(message.split()) <= _GREETING_MAX_WORDS:
         return "greeting"
-    if any(w in m for w in ["money", "transfer", "send", "pay", "cash", "fund",
-                             "account", "dollar", "rupee", "fee", "cost", "price"]):
-        return "money"
-    if any(w in m for w in ["urgent", "immediately", "now", "asap", "hurry",
-                             "quick", "fast", "emergency", "suspended", "hacked"]):
-        return "urgent"
-    if any(w in m for w in ["won", "winner", "prize", "congratulations", "selected",
-                             "reward", "gift", "free", "lucky"]):
-        return "prize"
+    for intent in _INTENT_PRIORITY:
+        if intent in found:
+            return intent
     return "default"
 
 
+def _detect_intent(message: str) -> str:
+    """Classify the incoming message into a rough intent bucket."""
+    return _resolve_intent(_match_intents(message), message)
+
+
+def detect_intents(messages: Iterable[str]) -> List[str]:
+    """
+    Classify a batch of messages; same buckets as _detect_intent.
+    Scam traffic is highly repetitive, so each distinct message is only matched once.
+    """
+    seen: Dict[str, str] = {}
+    intents = []
+    for message in messages:
+        intent = seen.get(message)
+        if intent is None:
+            intent = seen[message] = _resolve_intent(_match_intents(message), message)
+        intents.append(intent)
+    return intents
+
+
+_TRAIT_KEYS = tuple(_RESPONSES)
+_INTENT_KEYS = ("greeting", "money", "urgent", "prize", "default")
+_INTENT_INDEX = {intent: i for i, intent in enumerate(_INTENT_KEYS)}
+
+
+def _index_pools():
+    """Flatten _RESPONSES into one array with (trait, intent) -> start/size offsets."""
+    texts = []
+    start = np.zeros((len(_TRAIT_KEYS), len(_INTENT_KEYS)), dtype=np.int64)
+    size = np.zeros_like(start)
+    for t, trait in enumerate(_TRAIT_KEYS):
+        for i, intent in enumerate(_INTENT_KEYS):
+            pool = _RESPONSES[trait][intent]
+            start[t, i], size[t, i] = len(texts), len(pool)
+            texts.extend(pool)
+    return np.array(texts, dtype=object), start, size
+
+
+_POOL_TEXT, _POOL_START, _POOL_SIZE = _index_pools()
+
+
+def scores_to_matrix(profiles: Iterable[Dict[str, float]]) -> np.ndarray:
+    """Stack personality score dicts into an N x 5 array in BIG_FIVE column order."""
+    return np.array([[p.get(trait, 0.5) for trait in BIG_FIVE] for p in profiles],
+                    dtype=np.float64).reshape(-1, len(BIG_FIVE))
+
+
+# Dominant trait = nearest TRAIT_SCORE_TEMPLATES centroid, precomputed over a grid of
+# _GRID_LEVELS steps per dimension (0.05 apart) so resolving is a single table lookup
+_GRID_LEVELS = 21
+_CENTROIDS = np.array([[TRAIT_SCORE_TEMPLATES[key][t] for t in BIG_FIVE] for key in _TRAIT_KEYS])
+_trait_table: Optional[np.ndarray] = None
+
+
+def _build_trait_table() -> np.ndarray:
+    """uint8 table of shape (_GRID_LEVELS,) * 5 holding the nearest centroid's _TRAIT_KEYS index."""
+    levels = np.linspace(0.0, 1.0, _GRID_LEVELS)
+    # Squared distance splits per dimension: sq[d][level, centroid]
+    sq = [(levels[:, None] - _CENTROIDS[None, :, d]) ** 2 for d in range(len(BIG_FIVE))]
+    rest = (sq[1][:, None, None, None, :] + sq[2][None, :, None, None, :]
+            + sq[3][None, None, :, None, :] + sq[4][None, None, None, :, :])
+    table = np.empty((_GRID_LEVELS,) * len(BIG_FIVE), dtype=np.uint8)
+    for i in range(_GRID_LEVELS):  # one slab at a time keeps the temporary small
+        table[i] = (rest + sq[0][i]).argmin(axis=-1)
+    return table
+
+
+def _get_trait_table() -> np.ndarray:
+    global _trait_table
+    if _trait_table is None:
+        _trait_table = _build_trait_table()
+    return _trait_table
+
+
+def _grid_index(value: float) -> int:
+    return int(round(min(max(value, 0.0), 1.0) * (_GRID_LEVELS - 1)))
+
+
 def _dominant_trait(scores: Dict[str, float]) -> str:
-    for trait_key, check in _TRAIT_MAP:
-        if check(scores):
-            return trait_key
-    return "average"
+    """Nearest trait centroid for one score dict; missing traits count as neutral 0.5."""
+    index = tuple(_grid_index(scores.get(t, 0.5)) for t in BIG_FIVE)
+    return _TRAIT_KEYS[_get_trait_table()[index]]
+
+
+def _dominant_traits(score_matrix: np.ndarray) -> np.ndarray:
+    """Vectorized _dominant_trait: index into _TRAIT_KEYS for every row of an N x 5 matrix."""
+    grid = np.rint(np.clip(score_matrix, 0.0, 1.0) * (_GRID_LEVELS - 1)).astype(np.intp)
+    return _get_trait_table()[tuple(grid.T)]
+
+
+def _word_chunks(text: str) -> Iterator[str]:
+    """Split a finished reply into word-sized stream chunks (each keeps its trailing space)."""
+    return iter(re.findall(r"\S+\s*", text))
+
+
+# Conversation id used when callers don't pass one
+DEFAULT_SESSION = "default"
 
 
 class ChatEngine:
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, max_sessions: int = 10_000,
+                 session_ttl: Optional[float] = 1800, model_batch_size: int = 8,
+                 model_max_wait_ms: float = 10.0, reply_cache_size: int = 50_000,
+                 reply_cache_ttl: Optional[float] = 3600, reply_variety: int = 3,
+                 seed: Optional[int] = None, intent_model_path: Optional[str] = None):
         self.model_path = model_path
-        # Track last used response per trait+intent to avoid immediate repeats
-        self._last_used: Dict[str, str] = {}
+        # Same seed (here or via core.seeding) + same inputs -> same replies
+        self.seed = seed
+        # Fine-tuned model replies when a checkpoint exists; template pools are the fallback
+        self.model_backend = None
+        if ModelReplyBackend.available(model_path):
+            self.model_backend = ModelReplyBackend(model_path, max_batch_size=model_batch_size,
+                                                   max_wait_ms=model_max_wait_ms)
+        # Trained intent classifier (python -m core.intent_classifier train); keywords otherwise
+        self.intent_classifier = None
+        intent_model_path = intent_model_path or os.getenv("INTENT_MODEL_PATH", DEFAULT_INTENT_MODEL_PATH)
+        if os.path.exists(intent_model_path):
+            try:
+                self.intent_classifier = IntentClassifier.load(intent_model_path)
+            except Exception as e:
+                print(f"Could not load intent classifier, using keywords: {e}")
+        # Scam traffic repeats a lot; don't regenerate the same reply for the same persona bucket
+        self.reply_cache = ReplyCache(max_entries=reply_cache_size, ttl_seconds=reply_cache_ttl,
+                                      variety=reply_variety, rng=make_rng(seed, "reply-cache"))
+        # Per-conversation state (repeat avoidance etc.), bounded and idle-evicted
+        self.sessions = SessionStore(ConversationState, max_sessions=max_sessions,
+                                     ttl_seconds=session_ttl)
+        self._np_rng = make_np_rng(seed, "chat-batch")
+        self.analyzer = PersonalityAnalyzer()
 
     def generate_chat_response(self, personality_scores: Dict[str, float],
-                               message: str, chat_history: List = None) -> str:
+                               message: str, chat_history: List = None,
+                               session_id: Optional[str] = None) -> str:
+        """
+        Reply to one incoming message. The session keeps its own bounded context
+        (see conversation_summary), so callers only send the new message;
+        chat_history is deprecated and only used to seed a brand-new session.
+        """
+        intent = self.classify_intents([message])[0]
+        reply = None
+        if self.model_backend is not None:
+            reply = self._model_reply(personality_scores, intent, message)
+        if not reply:
+            reply = self._template_reply(personality_scores, intent, session_id)
+        self._record_turn(session_id, message, intent, reply, chat_history)
+        return reply
+
+    def stream_chat_response(self, personality_scores: Dict[str, float], message: str,
+                             chat_history: List = None,
+                             session_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the reply in pieces as soon as they exist: model tokens while they are
+        generated, otherwise the cached/template reply word by word.
+        Joining the pieces gives the same kind of reply generate_chat_response returns.
+        """
+        intent = self.classify_intents([message])[0]
+        pieces: List[str] = []
+        for piece in self._stream_reply(personality_scores, intent, message, session_id):
+            pieces.append(piece)
+            yield piece
+        self._record_turn(session_id, message, intent, "".join(pieces).strip(), chat_history)
+
+    def _stream_reply(self, personality_scores: Dict[str, float], intent: str, message: str,
+                      session_id: Optional[str]) -> Iterator[str]:
+        backend = self.model_backend
+        if backend is not None:
+            cache_key = self.reply_cache.key(personality_scores, intent, message)
+            reply = self.reply_cache.get(cache_key)
+            if reply:
+                yield from _word_chunks(reply)
+                return
+            pieces = []
+            try:
+                for piece in backend.stream(personality_scores, message):
+                    pieces.append(piece)
+                    yield piece
+            except Exception as e:
+                self._model_failed(backend, e)
+            reply = "".join(pieces).strip()
+            if reply:
+                self.reply_cache.add(cache_key, reply)
+                return
+            if pieces:
+                return  # whitespace-only output was already sent; don't append a template
+        yield from _word_chunks(self._template_reply(personality_scores, intent, session_id))
+
+    def _record_turn(self, session_id: Optional[str], message: str, intent: str, reply: str,
+                     chat_history: Optional[List] = None):
+        state = self.sessions.get(session_id or DEFAULT_SESSION)
+        if chat_history and not state.turn_count:
+            # Legacy clients resend the transcript; only its tail fits the ring buffer
+            for entry in chat_history[-state.turns.maxlen:]:
+                state.record(entry.get("sender") or entry.get("role") or "unknown",
+                             entry.get("text") or entry.get("content") or "")
+        state.record("scammer", message, intent)
+        state.record("profile", reply)
+        # Folded in lazily, when the session's personality is read
+        self._estimator(state, "scammer").defer(message)
+        self._estimator(state, "profile").defer(reply)
+
+    def _estimator(self, state: ConversationState, sender: str) -> IncrementalEstimator:
+        estimator = state.estimators.get(sender)
+        if estimator is None:
+            estimator = state.estimators[sender] = IncrementalEstimator(self.analyzer)
+        return estimator
+
+    def _model_reply(self, personality_scores: Dict[str, float], intent: str,
+                     message: str) -> Optional[str]:
+        backend = self.model_backend
+        cache_key = self.reply_cache.key(personality_scores, intent, message)
+        reply = self.reply_cache.get(cache_key)
+        if reply:
+            return reply
+        try:
+            reply = backend.generate(personality_scores, message)
+        except Exception as e:
+            self._model_failed(backend, e)
+            return None
+        if reply:
+            self.reply_cache.add(cache_key, reply)
+        return reply
+
+    def _model_failed(self, backend: ModelReplyBackend, error: Exception):
+        if backend.load_error is not None:
+            # Missing torch/transformers or a bad checkpoint: stop trying
+            print(f"Could not load chat model, using templates: {error}")
+            self.model_backend = None
+            backend.close()
+        else:
+            print(f"Model generation failed, using templates: {error}")
+
+    def _template_reply(self, personality_scores: Dict[str, float], intent: str,
+                        session_id: Optional[str]) -> str:
         trait = _dominant_trait(personality_scores)
-        intent = _detect_intent(message)
         pool = _RESPONSES[trait][intent]
+        session_id = session_id or DEFAULT_SESSION
+        state = self.sessions.get(session_id)
+        if state.rng is None:
+            state.rng = make_rng(self.seed, "session", session_id)
 
-        # Avoid repeating the last response for this trait+intent combo
+        # Avoid repeating this conversation's last response for this trait+intent combo
         cache_key = f"{trait}:{intent}"
-        last = self._last_used.get(cache_key)
+        last = state.last_used.get(cache_key)
         choices = [r for r in pool if r != last] or pool
-        reply = random.choice(choices)
-        self._last_used[cache_key] = reply
+        reply = state.rng.choice(choices)
+        state.last_used[cache_key] = reply
         return reply
 
-    def analyze_personality_from_text(self, text: str) -> Dict[str, float]:
+    def classify_intents(self, messages: Sequence[str]) -> List[str]:
+        """Intent per message: the trained classifier if loaded, keyword matching when unsure."""
+        if self.intent_classifier is None:
+            return detect_intents(messages)
+        return self.intent_classifier.predict(messages, fallback=detect_intents)
+
+    def conversation_summary(self, session_id: str) -> Optional[Dict]:
+        """Intent counts, escalation stage and recent turns; None for an unknown session."""
+        state = self.sessions.peek(session_id)
+        return state.summary() if state is not None else None
+
+    def conversation_personality(self, session_id: str,
+                                 sender: str = "scammer") -> Optional[Dict]:
+        """Live Big Five estimate for one side of a conversation, updated every turn."""
+        state = self.sessions.peek(session_id)
+        if state is None or sender not in state.estimators:
+            return None
+        return state.estimators[sender].snapshot()
+
+    def end_session(self, session_id: str) -> bool:
+        """Drop a conversation's state; returns False if it was unknown or already evicted."""
+        return self.sessions.discard(session_id)
+
+    def session_stats(self) -> Dict[str, float]:
+        return self.sessions.stats()
+
+    def reply_cache_stats(self) -> Dict[str, float]:
+        return self.reply_cache.stats()
+
+    def generate_chat_responses_batch(self, score_matrix, messages: Sequence[str],
+                                      rng: Optional[np.random.Generator] = None) -> List[str]:
         """
-        Analyze text to get personality scores
-        (You should train an ML model for this)
+        Generate one reply per (scores, message) pair.
+
+        Args:
+            score_matrix: N x 5 array-like in BIG_FIVE column order
+                          (see scores_to_matrix for converting score dicts)
+            messages: N incoming messages
+            rng: optional NumPy Generator for reproducible picks
+
+        Replies are drawn uniformly from the same pools as generate_chat_response;
+        per-combo repeat avoidance is not applied within a batch.
         """
-        # Simplified version - in reality, use your trained model
-        text_lower = text.lower()
-
-        scores = {
-            "neuroticism": 0.5,
-            "agreeableness": 0.5,
-            "conscientiousness": 0.5,
-            "extraversion": 0.5,
-            "openness": 0.5
-        }
-
-        # Simple keyword analysis
-        if any(word in text_lower for word in ["worry", "anxious", "stress"]):
-            scores["neuroticism"] = 0.8
-        if any(word in text_lower for word in ["help", "kind", "trust"]):
-            scores["agreeableness"] = 0.8
-        if any(word in text_lower for word in ["party", "social", "fun"]):
-            scores["extraversion"] = 0.8
-        if any(word in text_lower for word in ["art", "creative", "imagine"]):
-            scores["openness"] = 0.8
-
-        return scores
+        scores = np.asarray(score_matrix, dtype=np.float64).reshape(-1, len(BIG_FIVE))
+        if len(scores) != len(messages):
+            raise ValueError(f"Got {len(scores)} score rows for {len(messages)} messages")
+        if not len(messages):
+            return []
+
+        traits = _dominant_traits(scores)
+        intents = np.fromiter((_INTENT_INDEX[i] for i in self.classify_intents(messages)),
+                              dtype=np.int64, count=len(messages))
+
+        rng = rng or self._np_rng
+        sizes = _POOL_SIZE[traits, intents]
+        offsets = (rng.random(len(messages)) * sizes).astype(np.int64)
+        return _POOL_TEXT[_POOL_START[traits, intents] + offsets].tolist()
+
+    def analyze_personality_from_text(self, text: str) -> Dict[str, float]:
+        """Score text on the Big Five with the weighted trait lexicon."""
+        return self.analyzer.analyze(text)
+
+    # Older callers (backend_api, test_integration) use this name
+    analyze_response_personality = analyze_personality_from_text
+
+    def analyze_personality_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """Score many texts at once; returns an N x 5 array in BIG_FIVE column order."""
+        return self.analyzer.score_texts(texts)
 
 
 # Global instance and function for imports
 chat_engine = ChatEngine()
 
 
-def generate_chat_response(personality_scores, message, chat_history=None):
-    return chat_engine.generate_chat_response(personality_scores, message, chat_history)
\ No newline at end of file
+def generate_chat_response(personality_scores, message, chat_history=None, session_id=None):
+    return chat_engine.generate_chat_response(personality_scores, message, chat_history, session_id)
+
+
+def generate_chat_responses_batch(score_matrix, messages, rng=None):
+    return chat_engine.generate_chat_responses_batch(score_matrix, messages, rng)
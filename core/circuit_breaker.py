@@ -0,0 +1,126 @@
+"""
+core/circuit_breaker.py - Closed / open / half-open circuit breaker for flaky dependencies
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making the call while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of the last `window` calls. A call is bad when it raises or
+    takes longer than slow_call_seconds. Once at least min_calls are in the window
+    and the bad share reaches failure_rate, the circuit opens: calls are rejected
+    with CircuitOpenError for open_seconds, then up to half_open_calls trial calls
+    go through. If all succeed the circuit closes with a fresh window; any bad trial
+    opens it again.
+    """
+
+    def __init__(self, name: str = "llm", window: int = 20, min_calls: int = 5,
+                 failure_rate: float = 0.5, slow_call_seconds: Optional[float] = 10.0,
+                 open_seconds: float = 30.0, half_open_calls: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque = deque(maxlen=window)  # True = bad call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_passed = 0
+        self._counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0}
+        self._transitions: Dict[str, int] = {}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def call(self, fn: Callable, *args, **kwargs):
+        return self.call_within(self.slow_call_seconds, fn, *args, **kwargs)
+
+    def call_within(self, slow_call_seconds: Optional[float], fn: Callable, *args, **kwargs):
+        """call() with its own slow-call threshold, for calls expected to run longer than most."""
+        self._acquire()
+        start = self._clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._record(failed=True, seconds=self._clock() - start, slow_call_seconds=slow_call_seconds)
+            raise
+        self._record(failed=False, seconds=self._clock() - start, slow_call_seconds=slow_call_seconds)
+        return result
+
+    def _acquire(self):
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN or (self._state == HALF_OPEN
+                                       and self._trials_started >= self.half_open_calls):
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(f"Circuit '{self.name}' is open")
+            if self._state == HALF_OPEN:
+                self._trials_started += 1
+
+    def _record(self, failed: bool, seconds: float, slow_call_seconds: Optional[float]):
+        slow = slow_call_seconds is not None and seconds > slow_call_seconds
+        bad = failed or slow
+        with self._lock:
+            self._counters["calls"] += 1
+            self._counters["failures"] += failed
+            self._counters["slow_calls"] += slow
+            if self._state == HALF_OPEN:
+                if bad:
+                    self._transition(OPEN)
+                else:
+                    self._trials_passed += 1
+                    if self._trials_passed >= self.half_open_calls:
+                        self._transition(CLOSED)
+                return
+            if self._state == OPEN:
+                return  # a call that started before the circuit opened
+            self._outcomes.append(bad)
+            if (len(self._outcomes) >= self.min_calls
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate):
+                self._transition(OPEN)
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state: str):
+        key = f"{self._state}->{state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        print(f"Circuit '{self.name}': {key}")
+        self._state = state
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == HALF_OPEN:
+            self._trials_started = self._trials_passed = 0
+        else:
+            self._outcomes.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._maybe_half_open()
+            stats: Dict[str, object] = dict(self._counters)
+            stats["state"] = self._state
+            stats["transitions"] = dict(self._transitions)
+            stats["window_failure_rate"] = (sum(self._outcomes) / len(self._outcomes)
+                                            if self._outcomes else 0.0)
+            stats["open_for_seconds"] = (max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+                                         if self._state == OPEN else 0.0)
+        return stats
@@ -0,0 +1,97 @@
+"""
+core/consistency.py - Batched bio / trait keyword verification with a coverage report
+
+ConsistencyChecker compiles each trait's keywords into one alternation regex up
+front, so checking a bio is one lowercase plus one search that stops at the
+first hit, and check() runs a whole batch in one pass into a NumPy mask. A bio
+passes when any keyword for its trait occurs in it as a substring (the same rule
+as the old per-profile checks). Traits with no keywords, like "average", pass
+unless unknown_passes is False.
+"""
+
+import re
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Keywords BaitGenerator.verify_profile_consistency looks for in each trait's bios
+TRAIT_KEYWORDS = {
+    "high_neuroticism": ["anxious", "worry", "stress", "nervous", "overthink"],
+    "high_agreeableness": ["kind", "help", "trust", "good", "nice", "polite"],
+    "high_extraversion": ["party", "social", "energy", "friends", "outgoing", "fun"],
+    "low_conscientiousness": ["spontaneous", "moment", "forgot", "plans", "boring"],
+    "high_openness": ["art", "creative", "imagine", "explore", "dream", "consciousness"]
+}
+# Leading words of a failing bio that make up its pattern in the report
+PATTERN_WORDS = 5
+TOP_FAILURES = 10
+
+
+class ConsistencyChecker:
+    """Keyword verifier for many profiles at once; build one and reuse it."""
+
+    def __init__(self, trait_keywords: Optional[Dict[str, List[str]]] = None,
+                 unknown_passes: bool = True):
+        self.trait_keywords = TRAIT_KEYWORDS if trait_keywords is None else trait_keywords
+        self.unknown_passes = unknown_passes
+        self._search = {
+            trait: re.compile("|".join(re.escape(kw.lower()) for kw in keywords)).search
+            for trait, keywords in self.trait_keywords.items() if keywords
+        }
+
+    def matches(self, trait: str, bio: str) -> bool:
+        """Single-profile check."""
+        search = self._search.get(trait)
+        if search is None:
+            return self.unknown_passes
+        return search(bio.lower()) is not None
+
+    def check(self, traits: Sequence[str], bios: Sequence[str]) -> np.ndarray:
+        """Boolean mask, True where bio i reflects traits[i]."""
+        if len(traits) != len(bios):
+            raise ValueError(f"{len(traits)} traits for {len(bios)} bios")
+        searches, default = self._search, self.unknown_passes
+        return np.array([searches[trait](bio.lower()) is not None if trait in searches else default
+                         for trait, bio in zip(traits, bios)], dtype=bool)
+
+    def check_profiles(self, profiles: Iterable[Dict[str, Any]]) -> np.ndarray:
+        profiles = profiles if isinstance(profiles, list) else list(profiles)
+        return self.check([p["trait"] for p in profiles], [p["bio"] for p in profiles])
+
+    def verify(self, traits: Sequence[str], bios: Sequence[str],
+               top: int = TOP_FAILURES) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """check() plus report(); the usual quality gate for a generated batch."""
+        mask = self.check(traits, bios)
+        return mask, self.report(traits, bios, mask, top)
+
+    def report(self, traits: Sequence[str], bios: Sequence[str], mask: np.ndarray,
+               top: int = TOP_FAILURES) -> Dict[str, Any]:
+        """
+        Pass rate overall and per trait, plus the most common failing patterns:
+        (trait, first PATTERN_WORDS words of the bio) pairs among failures, which
+        surface templated LLM openings and fallback bios that miss their keywords.
+        """
+        totals = Counter(traits)
+        passed = Counter(compress(traits, mask))
+        failures = Counter(
+            (traits[i], " ".join(bios[i].lower().split()[:PATTERN_WORDS]))
+            for i in np.flatnonzero(~mask)
+        )
+        return {
+            "profiles": len(mask),
+            "passed": int(mask.sum()),
+            "pass_rate": float(mask.mean()) if len(mask) else 1.0,
+            "by_trait": {
+                trait: {"profiles": total, "passed": passed[trait], "pass_rate": passed[trait] / total}
+                for trait, total in sorted(totals.items())
+            },
+            "top_failures": [
+                {"trait": trait, "pattern": pattern, "count": count}
+                for (trait, pattern), count in failures.most_common(top)
+            ],
+        }
+
+
+DEFAULT_CHECKER = ConsistencyChecker()
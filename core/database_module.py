@@ -1,59 +1,209 @@
+"""
+core/database_module.py - Profile storage in SQLite
+
+Each thread keeps one connection to DB_NAME, opened on first use and closed when
+the thread exits, in WAL mode with synchronous=NORMAL: commits no longer fsync
+(only checkpoints do), and readers don't block the writer. A crash can lose the
+last few commits but never corrupts the database. Statements use fixed SQL strings so sqlite3's per-connection
+statement cache prepares each one once.
+
+The schema is versioned (core/migrations.py). It is brought up to date the first
+time a process connects to a database, not at import, so importing this module
+never touches the disk.
+"""
+
+import atexit
+import json
+import os
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from itertools import islice
+
+from core.consistency import DEFAULT_CHECKER
+from core.migrations import migrate
 
 DB_NAME = "database.db"
+# Seconds a writer waits on a locked database before failing
+BUSY_TIMEOUT = 30.0
+STATEMENT_CACHE_SIZE = 128
+# Rows per transaction in save_profiles_bulk
+BULK_CHUNK_SIZE = 1000
+
+INSERT_PROFILE_SQL = """
+    INSERT INTO profiles (
+        bio,
+        openness,
+        conscientiousness,
+        extraversion,
+        agreeableness,
+        neuroticism,
+        trait,
+        scam_type,
+        name,
+        age,
+        location,
+        occupation,
+        interests,
+        consistency_ok
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_local = threading.local()
+_connections = weakref.WeakSet()  # every live _ThreadConnection, for close_connections
+_connections_lock = threading.Lock()
+_generation = 0  # bumped by close_connections so every thread reconnects
+_migrated = set()  # database paths this process has brought up to date
+_migrate_lock = threading.Lock()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE,
+                           check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class _ThreadConnection:
+    """
+    A thread's connection, held only by that thread's local storage: when the
+    thread exits (or replaces it) the holder is freed and closes the connection,
+    so short-lived threads don't leave connections and file descriptors behind.
+    """
+
+    __slots__ = ("conn", "key", "__weakref__")
+
+    def __init__(self, conn, key):
+        self.conn, self.key = conn, key
+
+    def __del__(self):
+        # A connection inherited across fork belongs to the parent; leave it alone
+        if self.key[1] == os.getpid():
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+
+
+def get_connection():
+    """This thread's connection to DB_NAME; reopened after DB_NAME changes, a fork or a close."""
+    key = (DB_NAME, os.getpid(), _generation)
+    holder = getattr(_local, "holder", None)
+    if holder is None or holder.key != key:
+        holder = _ThreadConnection(_connect(DB_NAME), key)
+        # Before caching it: if the migration fails (e.g. the database is locked)
+        # the connection is dropped and the next call tries again
+        _ensure_schema(holder.conn, DB_NAME)
+        _local.holder = holder  # frees (and closes) the one it replaces
+        with _connections_lock:
+            _connections.add(holder)
+    return holder.conn
+
+
+def _ensure_schema(conn, path):
+    if path in _migrated:
+        return
+    with _migrate_lock:
+        if path not in _migrated:
+            migrate(conn)
+            _migrated.add(path)
+
+
+@contextmanager
+def transaction():
+    """Commit on success, roll back on error; the connection stays open for reuse."""
+    conn = get_connection()
+    with conn:
+        yield conn
+
+
+@atexit.register
+def close_connections():
+    """Close every thread's connection (run at exit; also handy in tests)."""
+    global _generation
+    with _connections_lock:
+        holders = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for holder in holders:
+        try:
+            holder.conn.close()
+        except sqlite3.Error:
+            pass
+
 
 def init_db():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS profiles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            bio TEXT NOT NULL,
-            openness REAL,
-            conscientiousness REAL,
-            extraversion REAL,
-            agreeableness REAL,
-            neuroticism REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-init_db()
+    """Create or migrate DB_NAME now rather than on first use; returns the schema version."""
+    conn = get_connection()
+    with _migrate_lock:
+        version = migrate(conn)
+        _migrated.add(DB_NAME)
+    return version
+
+def _profile_row(profile_data):
+    # Dashboard profiles carry "personality"; BaitGenerator profiles "personality_scores"
+    personality = profile_data.get("personality") or profile_data["personality_scores"]
+    demographics = profile_data.get("demographics") or {}
+    trait = profile_data.get("trait") or profile_data.get("target_trait") or None
+    consistent = profile_data.get("consistency_ok", profile_data.get("consistency_check"))
+    if consistent is None and trait:
+        consistent = DEFAULT_CHECKER.matches(trait, profile_data["bio"])
+    interests = demographics.get("interests")
+    return (
+        profile_data["bio"],
+        personality["openness"],
+        personality["conscientiousness"],
+        personality["extraversion"],
+        personality["agreeableness"],
+        personality["neuroticism"],
+        trait,
+        profile_data.get("scam_type") or None,
+        demographics.get("name"),
+        demographics.get("age"),
+        demographics.get("location"),
+        demographics.get("occupation"),
+        json.dumps(list(interests)) if interests is not None else None,
+        None if consistent is None else int(bool(consistent)),
+    )
 
 def save_profile(profile_data):
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO profiles (
-                bio,
-                openness,
-                conscientiousness,
-                extraversion,
-                agreeableness,
-                neuroticism
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                profile_data["bio"],
-                profile_data["personality"]["openness"],
-                profile_data["personality"]["conscientiousness"],
-                profile_data["personality"]["extraversion"],
-                profile_data["personality"]["agreeableness"],
-                profile_data["personality"]["neuroticism"],
-            )
-        )
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute(INSERT_PROFILE_SQL, _profile_row(profile_data))
         return True
     except Exception as e:
         print(f"Database error: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def save_profiles_bulk(profiles, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Insert any iterable of profiles (a generator is fine) chunk_size rows per
+    transaction with executemany, holding one chunk in memory at a time.
+
+    Returns the inserted ids as ranges, one per run of consecutive ids:
+    each chunk is written under BEGIN IMMEDIATE, so its ids are contiguous,
+    and adjacent chunks merge into one range. A single writer gets a single
+    range whatever the input size; sum(map(len, ids)) is the row count.
+
+    A bad profile or database error rolls back its chunk and raises; earlier
+    chunks stay committed.
+    """
+    conn = get_connection()
+    iterator = iter(profiles)
+    ids = []
+    while True:
+        rows = [_profile_row(p) for p in islice(iterator, chunk_size)]
+        if not rows:
+            return ids
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(INSERT_PROFILE_SQL, rows)
+            last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        chunk = range(last - len(rows) + 1, last + 1)
+        if ids and ids[-1].stop == chunk.start:
+            ids[-1] = range(ids[-1].start, chunk.stop)
+        else:
+            ids.append(chunk)
@@ -0,0 +1,233 @@
+"""
+core/dedup_index.py - MinHash LSH index for near-duplicate bio detection
+
+Bios are turned into character shingles, MinHash signatures and LSH band keys.
+Band keys live in SQLite next to the profiles table (core.database_module.DB_NAME
+by default), so "is this bio within Jaccard `threshold` of any stored bio" is a
+handful of indexed lookups plus a signature comparison for the few candidates,
+however many bios are stored. Inserts are incremental.
+"""
+
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+THRESHOLD = 0.8
+SHINGLE_SIZE = 5  # bytes; shingles are packed into one uint64, so at most 8
+# Chance that a pair exactly at the threshold shares a band and gets compared
+TARGET_RECALL = 0.9
+# Fixed so signatures stay comparable across processes and restarts
+HASH_SEED = 1
+
+_SPACE_RE = re.compile(r"[^a-z0-9]+")
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Unique byte k-grams (k <= 8) of the normalized text, packed into uint64 values."""
+    data = np.frombuffer(_SPACE_RE.sub(" ", text.lower()).strip().encode("utf-8"), dtype=np.uint8)
+    if len(data) <= k:
+        data = np.pad(data, (0, k - len(data) + 1))
+    data = data.astype(np.uint64)
+    n = len(data) - k + 1
+    grams = data[:n].copy()
+    for j in range(1, k):
+        grams |= data[j:j + n] << np.uint64(8 * j)
+    return np.unique(grams)
+
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two bios with this Jaccard similarity share at least one band."""
+    return 1.0 - (1.0 - similarity ** rows) ** bands
+
+
+def choose_bands(num_perm: int, threshold: float, target_recall: float = TARGET_RECALL) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm: the fewest bands (so the fewest
+    dissimilar candidates) that still make pairs at threshold candidates with
+    probability target_recall. This puts the steep part of the S-curve below the
+    threshold instead of centring it there, which would miss half the pairs at it.
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    for bands, rows in options:
+        if candidate_probability(threshold, bands, rows) >= target_recall:
+            return bands, rows
+    return options[-1]
+
+
+class BioDedupIndex:
+    """
+    Persistent MinHash LSH index over bios.
+
+    query() returns the stored bio id with the highest estimated Jaccard similarity
+    at or above threshold (or None); add() inserts a bio and returns its id. The
+    hash family is stored with the index and must match on reopen; an index
+    banded differently has its band keys rebuilt from the stored signatures.
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: float = THRESHOLD,
+                 num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE):
+        if path is None:
+            from core.database_module import DB_NAME
+            path = DB_NAME
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        # Multiply-shift hashing: h_i(x) = ((a_i * x + b_i) mod 2^64) >> 32
+        rng = np.random.default_rng(HASH_SEED)
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2 ** 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        self._band_salt = rng.integers(0, 2 ** 63, self.bands, dtype=np.uint64)
+
+        # Re-entrant so check_and_add can hold it across its query and insert
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+        self._counters = {"queries": 0, "duplicates": 0, "inserted": 0, "candidates": 0}
+
+    def _create_tables(self):
+        c = self._conn
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS bio_minhash (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile_id INTEGER,
+                signature BLOB NOT NULL
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS bio_lsh (
+                band_key INTEGER NOT NULL,
+                bio_id INTEGER NOT NULL,
+                PRIMARY KEY (band_key, bio_id)
+            ) WITHOUT ROWID
+        """)
+        c.execute("CREATE TABLE IF NOT EXISTS bio_lsh_meta (key TEXT PRIMARY KEY, value TEXT)")
+        params = {"num_perm": self.num_perm, "bands": self.bands, "rows": self.rows,
+                  "shingle_size": self.shingle_size, "hash_seed": HASH_SEED}
+        stored = dict(c.execute("SELECT key, value FROM bio_lsh_meta"))
+        expected = {k: str(v) for k, v in params.items()}
+        if stored and stored != expected:
+            banding = ("bands", "rows")
+            if any(stored.get(k) != v for k, v in expected.items() if k not in banding):
+                raise ValueError(f"Existing bio index was built with {stored}, not {params}")
+            # Same hash family, different banding: the signatures are still valid,
+            # so only the band keys need recomputing
+            self._rebuild_bands()
+            print(f"Rebuilt bio index bands: {stored.get('bands')}x{stored.get('rows')} -> "
+                  f"{self.bands}x{self.rows}")
+        c.executemany("INSERT OR REPLACE INTO bio_lsh_meta VALUES (?, ?)", list(expected.items()))
+        c.commit()
+
+    def _rebuild_bands(self, chunk_size: int = 10000):
+        c = self._conn
+        c.execute("DELETE FROM bio_lsh")
+        last_id = 0
+        while True:
+            rows = c.execute("SELECT id, signature FROM bio_minhash WHERE id > ? ORDER BY id LIMIT ?",
+                             (last_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            c.executemany("INSERT OR IGNORE INTO bio_lsh VALUES (?, ?)",
+                          [(k, bio_id) for bio_id, signature in rows
+                           for k in self.band_keys(np.frombuffer(signature, dtype=np.uint32))])
+            last_id = rows[-1][0]
+
+    def signature(self, bio: str) -> np.ndarray:
+        return self.signatures([bio])[0]
+
+    def signatures(self, bios: List[str], chunk_size: int = 32) -> np.ndarray:
+        """N x num_perm uint32 MinHash signatures, hashing chunk_size bios per NumPy pass."""
+        out = np.empty((len(bios), self.num_perm), dtype=np.uint32)
+        for start in range(0, len(bios), chunk_size):
+            groups = [shingles(bio, self.shingle_size) for bio in bios[start:start + chunk_size]]
+            offsets = np.cumsum([0] + [len(g) for g in groups[:-1]])
+            # num_perm x shingles, so each bio's minimum is a contiguous reduceat along rows
+            hashed = np.multiply.outer(self._a, np.concatenate(groups))
+            hashed += self._b[:, None]
+            hashed >>= np.uint64(32)
+            out[start:start + len(groups)] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return out
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        bands = signature[:self.bands * self.rows].astype(np.uint64).reshape(self.bands, self.rows)
+        keys = (bands * self._band_mix).sum(axis=1) ^ self._band_salt
+        return keys.view(np.int64).tolist()
+
+    def query(self, bio: str) -> Optional[Tuple[int, float]]:
+        """(bio id, estimated Jaccard) of the most similar stored bio at or above threshold."""
+        return self._query(self.signature(bio))
+
+    def is_duplicate(self, bio: str) -> bool:
+        return self.query(bio) is not None
+
+    def _query(self, signature: np.ndarray) -> Optional[Tuple[int, float]]:
+        keys = self.band_keys(signature)
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, signature FROM bio_minhash WHERE id IN "
+                f"(SELECT bio_id FROM bio_lsh WHERE band_key IN ({marks}))", keys
+            ).fetchall()
+            self._counters["queries"] += 1
+            self._counters["candidates"] += len(rows)
+        if not rows:
+            return None
+        ids = [r[0] for r in rows]
+        stored = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.uint32).reshape(len(rows), -1)
+        similarity = (stored == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] < self.threshold:
+            return None
+        with self._lock:
+            self._counters["duplicates"] += 1
+        return ids[best], float(similarity[best])
+
+    def add(self, bio: str, profile_id: Optional[int] = None) -> int:
+        return self.add_many([(bio, profile_id)])[0]
+
+    def add_many(self, items: Iterable[Tuple[str, Optional[int]]]) -> List[int]:
+        """Insert (bio, profile_id) pairs in one transaction; returns their index ids."""
+        items = list(items)
+        signatures = self.signatures([bio for bio, _ in items])
+        with self._lock, self._conn:
+            return [self._insert(profile_id, signature)
+                    for (_, profile_id), signature in zip(items, signatures)]
+
+    def check_and_add(self, bio: str, profile_id: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """Insert bio unless it is a near-duplicate; returns the match it collided with, if any."""
+        signature = self.signature(bio)
+        with self._lock:
+            match = self._query(signature)
+            if match is None:
+                with self._conn:
+                    self._insert(profile_id, signature)
+        return match
+
+    def _insert(self, profile_id: Optional[int], signature: np.ndarray) -> int:
+        bio_id = self._conn.execute("INSERT INTO bio_minhash (profile_id, signature) VALUES (?, ?)",
+                                    (profile_id, signature.tobytes())).lastrowid
+        self._conn.executemany("INSERT OR IGNORE INTO bio_lsh VALUES (?, ?)",
+                               [(k, bio_id) for k in self.band_keys(signature)])
+        self._counters["inserted"] += 1
+        return bio_id
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bio_minhash").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counters)
+        stats["mean_candidates"] = stats["candidates"] / stats["queries"] if stats["queries"] else 0.0
+        stats.update(threshold=self.threshold, bands=self.bands, rows=self.rows)
+        return stats
@@ -0,0 +1,133 @@
+"""
+core/demographics.py - Demographic vocabularies and a columnar (NumPy) profile factory
+
+sample_demographics(n) draws every column for n profiles in one call and keeps
+them as index arrays into the vocabularies below (struct of arrays); rows only
+become dicts when they are read, in the same shape BaitGenerator produces.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+FIRST_NAMES = ("Emma", "Liam", "Olivia", "Noah", "Ava", "Oliver", "Sophia", "Elijah", "Isabella", "Lucas")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez")
+INTERESTS = ("reading", "gaming", "hiking", "cooking", "photography",
+             "music", "travel", "yoga", "movies", "technology")
+LOCATIONS = ("New York", "Los Angeles", "Chicago", "Miami", "Austin")
+OCCUPATIONS = ("Marketing Specialist", "Software Developer", "Teacher",
+               "Nurse", "Graphic Designer", "Sales Representative")
+MIN_AGE, MAX_AGE = 18, 65  # inclusive, like random.randint
+INTERESTS_PER_PROFILE = 3
+
+_NAMES = np.array([f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES], dtype=object)
+_INTEREST_TEXT = np.array(INTERESTS, dtype=object)
+_LOCATION_TEXT = np.array(LOCATIONS, dtype=object)
+_OCCUPATION_TEXT = np.array(OCCUPATIONS, dtype=object)
+
+
+class DemographicsBatch:
+    """
+    N demographics as columns: age (int16), name / location / occupation (uint8
+    indices) and interests (N x 3 uint8 indices, distinct within a row).
+    Indexing or iterating yields the usual demographics dicts.
+    """
+
+    def __init__(self, age: np.ndarray, name: np.ndarray, interests: np.ndarray,
+                 location: np.ndarray, occupation: np.ndarray):
+        self.age = age
+        self.name = name
+        self.interests = interests
+        self.location = location
+        self.occupation = occupation
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return {
+            "name": _NAMES[self.name[i]],
+            "age": int(self.age[i]),
+            "interests": [INTERESTS[j] for j in self.interests[i]],
+            "location": LOCATIONS[self.location[i]],
+            "occupation": OCCUPATIONS[self.occupation[i]],
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+
+    # Whole-column text views, for dataframes or bulk inserts
+    def names(self) -> np.ndarray:
+        return _NAMES[self.name]
+
+    def locations(self) -> np.ndarray:
+        return _LOCATION_TEXT[self.location]
+
+    def occupations(self) -> np.ndarray:
+        return _OCCUPATION_TEXT[self.occupation]
+
+    def interest_names(self) -> np.ndarray:
+        return _INTEREST_TEXT[self.interests]
+
+
+def sample_interests(n: int, rng: np.random.Generator) -> np.ndarray:
+    """N x 3 interest indices, each row a uniform draw without replacement (random.sample)."""
+    k = len(INTERESTS)
+    draws = rng.integers(0, [k, k - 1, k - 2], size=(n, INTERESTS_PER_PROFILE)).astype(np.uint8)
+    first, second, third = draws.T
+    # Shift later draws past the values already taken
+    second += second >= first
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    third += third >= low
+    third += third >= high
+    return draws
+
+
+def sample_demographics(n: int, rng: Optional[np.random.Generator] = None) -> DemographicsBatch:
+    rng = rng or np.random.default_rng()
+    highs = [MAX_AGE - MIN_AGE + 1, len(_NAMES), len(LOCATIONS), len(OCCUPATIONS)]
+    columns = rng.integers(0, highs, size=(n, len(highs)), dtype=np.int16)
+    return DemographicsBatch(
+        age=columns[:, 0] + MIN_AGE,
+        name=columns[:, 1].astype(np.uint8),
+        interests=sample_interests(n, rng),
+        location=columns[:, 2].astype(np.uint8),
+        occupation=columns[:, 3].astype(np.uint8),
+    )
+
+
+class ProfileBatch:
+    """
+    N profiles as a trait index column plus a DemographicsBatch. Bios and scores are
+    per-trait lookups, so rows are assembled only when read.
+    """
+
+    def __init__(self, trait: np.ndarray, trait_names: Sequence[str], bios: Sequence[str],
+                 scores: Sequence[Dict[str, float]], demographics: DemographicsBatch,
+                 creation_date: str = "2024-03-15"):
+        self.trait = trait
+        self.trait_names = list(trait_names)
+        self.bios = list(bios)
+        self.scores = list(scores)
+        self.demographics = demographics
+        self.creation_date = creation_date
+
+    def __len__(self) -> int:
+        return len(self.trait)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        t = self.trait[i]
+        return {
+            "trait": self.trait_names[t],
+            "bio": self.bios[t],
+            "personality_scores": dict(self.scores[t]),
+            "demographics": self.demographics[i],
+            "creation_date": self.creation_date,
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
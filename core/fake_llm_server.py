@@ -0,0 +1,120 @@
+"""
+core/fake_llm_server.py - Local OpenAI-compatible stub for load-testing bio generation
+
+Answers POST /v1/chat/completions with a canned bio after an injected delay, and
+fails a configurable share of requests, so batch generation, retries and caching
+can be measured without an API key or network. Prompts asking for "N different
+bios" get a JSON array of N; usage reports estimated prompt/completion tokens,
+and token_ms adds per-completion-token latency like a real decoder:
+
+    python -m core.fake_llm_server --port 8089 --latency-ms 200 --error-rate 0.05
+    BaitGenerator(api_base="http://127.0.0.1:8089/v1")
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import re
+import socket
+import threading
+import time
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from core.bait_generator import DEFAULT_FALLBACK_BIO, FALLBACK_BIOS
+from core.llm_client import count_message_tokens, count_tokens
+
+_BIO_COUNT = re.compile(r"Write (\d+) different bios")
+
+
+def create_app(latency_ms: float = 200.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+               error_status: int = 500, seed: int = 0, token_ms: float = 0.0) -> FastAPI:
+    """
+    error_rate of requests (drawn from a seeded stream) get error_status after the
+    usual delay, e.g. 500 or 503 for server errors, 429 for rate limiting.
+    """
+    app = FastAPI(title="Fake LLM")
+    bios = list(FALLBACK_BIOS.values()) or [DEFAULT_FALLBACK_BIO]
+    counter = itertools.count()
+    failures = random.Random(seed)
+    stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+    app.state.stats = stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(body: Dict[str, Any]):
+        n = next(counter)
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        messages = body.get("messages") or []
+        wanted = _BIO_COUNT.search(messages[-1].get("content", "")) if messages else None
+        if wanted:
+            content = json.dumps([f"{bios[(n + i) % len(bios)]} (#{n}.{i})"
+                                  for i in range(int(wanted.group(1)))])
+        else:
+            content = f"{bios[n % len(bios)]} (#{n})"
+        prompt_tokens = count_message_tokens(messages) if messages else 0
+        completion_tokens = count_tokens(content)
+        try:
+            # Deterministic jitter: request n waits latency + (n % 10) / 10 * jitter
+            await asyncio.sleep((latency_ms + jitter_ms * (n % 10) / 10.0
+                                 + token_ms * completion_tokens) / 1000.0)
+        finally:
+            stats["in_flight"] -= 1
+        if error_rate and failures.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}},
+                                status_code=error_status)
+        return {
+            "id": f"chatcmpl-fake-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def serve_in_thread(app: FastAPI, host: str = "127.0.0.1", port: int = 0) -> str:
+    """Start app with uvicorn on a daemon thread; returns its base URL ("http://host:port")."""
+    import uvicorn
+
+    if not port:
+        with socket.socket() as s:
+            s.bind((host, 0))
+            port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="fake-llm", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub with injected latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--token-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+                     token_ms=args.token_ms)
+    uvicorn.run(app, host=args.host, port=args.port)
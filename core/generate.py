@@ -0,0 +1,175 @@
+"""
+core/generate.py - Bulk bait profile generation across a process pool
+
+Splits --count profiles into one shard per worker process. Each worker runs its
+own BaitGenerator and streams its shard to <output-dir>/profiles-<i>.jsonl[.gz|.zst]
+through ProfileWriter, so reruns resume shard by shard. With --seed every chunk
+is seeded from its shard and starting record, so a resumed run writes the same
+file as an uninterrupted one. A throughput and chunk-latency summary is printed
+at the end and saved to <output-dir>/summary.json.
+
+    python -m core.generate --count 1000000 --workers 8 --output-dir out/
+    python -m core.generate --traits high_neuroticism=3,average=1 --count 5000 \\
+        --workers 4 --output-dir out/ --api-base http://127.0.0.1:8089/v1
+
+Without an API key or --api-base (or with --offline) bios come from the
+fallback templates, which is CPU-bound and scales with the worker count.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.bait_generator import MAX_CONCURRENCY, TRAIT_SCORE_TEMPLATES, BaitGenerator
+from core.consistency import DEFAULT_CHECKER
+from core.profile_io import FLUSH_EVERY, ProfileWriter
+from core.seeding import derive_seed
+
+EXTENSIONS = {"none": ".jsonl", "gz": ".jsonl.gz", "zst": ".jsonl.zst"}
+
+
+def parse_trait_mix(spec: str) -> Optional[Dict[str, float]]:
+    """
+    "all" (uniform), "high_neuroticism,average" (uniform over those) or
+    "high_neuroticism=3,average=1" (relative weights).
+    """
+    if spec == "all":
+        return None
+    mix = {}
+    for part in spec.split(","):
+        trait, _, weight = part.strip().partition("=")
+        if trait not in TRAIT_SCORE_TEMPLATES:
+            raise ValueError(f"Unknown trait {trait!r}; expected one of {', '.join(TRAIT_SCORE_TEMPLATES)}")
+        mix[trait] = float(weight) if weight else 1.0
+        if mix[trait] < 0:
+            raise ValueError(f"Negative weight for {trait}")
+    if not sum(mix.values()):
+        raise ValueError("Trait mix weights sum to zero")
+    return mix
+
+
+def shard_sizes(count: int, shards: int) -> List[int]:
+    return [count // shards + (i < count % shards) for i in range(shards)]
+
+
+def _generate_shard(shard: int, count: int, path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker process: write one shard, timing every flushed chunk."""
+    seed = options["seed"]
+    generator = BaitGenerator(seed=None if seed is None else derive_seed(seed, "shard", shard),
+                              offline=options["offline"], api_base=options["api_base"],
+                              max_concurrency=options["max_concurrency"],
+                              batch_bios=options["batch_bios"])
+    chunk_seconds, passed = [], 0
+    start = time.perf_counter()
+    with ProfileWriter(path, flush_every=options["flush_every"], resume=True) as writer:
+        resumed = writer.records
+        while writer.records < count:
+            chunk_start = time.perf_counter()
+            # Seed each chunk from its position so a resumed shard doesn't repeat itself
+            generator.reseed("chunk", writer.records)
+            profiles = generator.batch_generate_profiles(min(options["flush_every"], count - writer.records),
+                                                         trait_mix=options["trait_mix"])
+            passed += int(DEFAULT_CHECKER.check_profiles(profiles).sum())
+            writer.write_many(profiles)
+            writer.flush()
+            chunk_seconds.append(time.perf_counter() - chunk_start)
+    if generator.llm is not None:
+        generator.llm.close()
+    return {"shard": shard, "path": path, "records": writer.records, "generated": writer.records - resumed,
+            "seconds": time.perf_counter() - start, "chunk_seconds": chunk_seconds, "consistent": passed}
+
+
+def generate(count: int, output_dir: str, workers: int = 1, trait_mix: Optional[Dict[str, float]] = None,
+             offline: bool = True, api_base: Optional[str] = None, seed: Optional[int] = None,
+             compress: str = "none", flush_every: int = FLUSH_EVERY,
+             max_concurrency: int = MAX_CONCURRENCY, batch_bios: bool = False,
+             quiet: bool = False) -> Dict[str, Any]:
+    """Generate count profiles into workers shards under output_dir; returns the run summary."""
+    os.makedirs(output_dir, exist_ok=True)
+    options = {"seed": seed, "offline": offline, "api_base": api_base, "flush_every": flush_every,
+               "max_concurrency": max_concurrency, "batch_bios": batch_bios, "trait_mix": trait_mix}
+    sizes = shard_sizes(count, workers)
+    paths = [os.path.join(output_dir, f"profiles-{i:03d}{EXTENSIONS[compress]}") for i in range(workers)]
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate_shard, i, size, path, options)
+                   for i, (size, path) in enumerate(zip(sizes, paths))]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not quiet:
+                print(f"shard {result['shard']}: {result['generated']:,} profiles in "
+                      f"{result['seconds']:.2f}s -> {result['path']}")
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: r["shard"])
+    chunks = np.array([s for r in results for s in r["chunk_seconds"]]) * 1000
+    generated = sum(r["generated"] for r in results)
+    summary = {
+        "profiles": sum(r["records"] for r in results),
+        "generated": generated,
+        "workers": workers,
+        "seconds": elapsed,
+        "profiles_per_second": generated / elapsed if elapsed else 0.0,
+        "per_worker_per_second": [r["generated"] / r["seconds"] if r["seconds"] else 0.0 for r in results],
+        "chunk_ms": {"p50": float(np.percentile(chunks, 50)), "p95": float(np.percentile(chunks, 95)),
+                     "max": float(chunks.max())} if len(chunks) else {},
+        "consistency_pass_rate": (sum(r["consistent"] for r in results) / generated) if generated else 1.0,
+        "shards": [r["path"] for r in results],
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m core.generate",
+                                     description="Generate bait profiles across a process pool")
+    parser.add_argument("--count", type=int, required=True, help="profiles to generate")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes / shards")
+    parser.add_argument("--traits", default="all",
+                        help='"all", "trait_a,trait_b" or weighted "trait_a=3,trait_b=1"')
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--compress", choices=sorted(EXTENSIONS), default="none")
+    parser.add_argument("--flush-every", type=int, default=FLUSH_EVERY)
+    parser.add_argument("--offline", action="store_true", help="fallback bios only, no LLM calls")
+    parser.add_argument("--api-base", default=os.getenv("LLM_API_BASE"))
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="LLM calls in flight per worker")
+    parser.add_argument("--batch-bios", action="store_true", help="several bios per LLM call")
+    args = parser.parse_args(argv)
+
+    try:
+        trait_mix = parse_trait_mix(args.traits)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.count < 0 or args.workers < 1:
+        parser.error("--count must be >= 0 and --workers >= 1")
+    offline = args.offline or not (os.getenv("OPENAI_API_KEY") or args.api_base)
+
+    summary = generate(args.count, args.output_dir, args.workers, trait_mix, offline=offline,
+                       api_base=args.api_base, seed=args.seed, compress=args.compress,
+                       flush_every=args.flush_every, max_concurrency=args.max_concurrency,
+                       batch_bios=args.batch_bios)
+    print(f"\n{summary['generated']:,} profiles ({summary['profiles']:,} on disk) in "
+          f"{summary['seconds']:.2f}s with {args.workers} workers"
+          f"{' (offline fallback bios)' if offline else ''}")
+    print(f"throughput: {summary['profiles_per_second']:,.0f} profiles/s")
+    if summary["chunk_ms"]:
+        print(f"chunk latency ({args.flush_every} profiles): p50 {summary['chunk_ms']['p50']:.1f} ms, "
+              f"p95 {summary['chunk_ms']['p95']:.1f} ms, max {summary['chunk_ms']['max']:.1f} ms")
+    print(f"consistency pass rate: {summary['consistency_pass_rate']:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+core/intent_classifier.py - Hashed TF-IDF + linear intent classifier for scam messages
+
+Train offline (needs scikit-learn), then ChatEngine loads the saved weights and falls
+back to keyword matching when the model is missing or not confident:
+
+    python -m core.intent_classifier train --out models/intent_classifier.npz
+    python -m core.intent_classifier bench --model models/intent_classifier.npz
+
+Inference only needs NumPy/SciPy: features are hashed with zlib.crc32, so the saved
+file is just the idf vector and the (sparse) linear weights.
+"""
+
+import json
+import os
+import re
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_MODEL_PATH = os.path.join("models", "intent_classifier.npz")
+# Below this top-class probability the keyword matcher decides instead
+MIN_CONFIDENCE = 0.5
+N_FEATURES = 2 ** 18
+# Longer messages are never greetings, whatever the model says (same rule as keyword matching)
+GREETING_MAX_WORDS = 5
+# Folds for the held-out evaluation train() reports before fitting on everything
+EVAL_FOLDS = 5
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def hash_features(messages: Sequence[str], n_features: int = N_FEATURES) -> sparse.csr_matrix:
+    """Unigram + bigram counts hashed into n_features columns (one CSR row per message)."""
+    crc32 = zlib.crc32
+    indices: List[int] = []
+    indptr = [0]
+    for message in messages:
+        tokens = _TOKEN_RE.findall(message.lower())
+        indices.extend([crc32(t.encode()) for t in tokens])
+        indices.extend([crc32(f"{a} {b}".encode()) for a, b in zip(tokens, tokens[1:])])
+        indptr.append(len(indices))
+    columns = np.asarray(indices, dtype=np.int64) % n_features
+    matrix = sparse.csr_matrix((np.ones(len(columns), dtype=np.float32), columns, indptr),
+                               shape=(len(messages), n_features))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def _tfidf(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    """Sublinear tf, idf weighting and L2 row normalization, computed on the CSR data arrays."""
+    x = counts.copy()
+    x.data = np.log1p(x.data) * idf[x.indices]
+    rows = np.repeat(np.arange(x.shape[0]), np.diff(x.indptr))
+    norms = np.sqrt(np.bincount(rows, weights=x.data.astype(np.float64) ** 2,
+                                minlength=x.shape[0]))
+    norms[norms == 0] = 1.0
+    x.data /= norms[rows].astype(x.data.dtype)
+    return x
+
+
+def load_training_messages(extra_path: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+    """
+    (message, intent) pairs from the repo's data. The bundled datasets carry no intent
+    labels, so those come back as None and get keyword labels at training time;
+    records in extra_path (JSONL with "message" and "intent") keep their labels.
+    """
+    from data.training_samples import TRAINING_DATA
+    from scam_generator import SCAM_MESSAGES
+    from scam_templates import TEMPLATES
+
+    pairs: List[Tuple[str, Optional[str]]] = [(s["message"], s.get("intent")) for s in TRAINING_DATA]
+    fine_tune_path = os.path.join("data", "fine_tune_data.json")
+    if os.path.exists(fine_tune_path):
+        with open(fine_tune_path, "r", encoding="utf-8") as f:
+            pairs.extend((s["scam_message"], s.get("intent")) for s in json.load(f))
+    pairs.extend((m, None) for m in SCAM_MESSAGES)
+    pairs.extend((t["message"], None) for kind in TEMPLATES.values() for t in kind)
+
+    if extra_path:
+        with open(extra_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    pairs.append((record["message"], record.get("intent")))
+    return pairs
+
+
+class IntentClassifier:
+    """One-vs-rest logistic model over hashed TF-IDF features."""
+
+    def __init__(self, classes: Sequence[str], idf: np.ndarray, weights: sparse.csr_matrix,
+                 intercept: np.ndarray, min_confidence: float = MIN_CONFIDENCE,
+                 greeting_max_words: Optional[int] = GREETING_MAX_WORDS):
+        self.classes = np.asarray(classes)
+        self.idf = idf
+        self.weights = weights  # n_features x n_classes
+        self.intercept = intercept
+        self.min_confidence = min_confidence
+        self.greeting_max_words = greeting_max_words
+        self.n_features = len(idf)
+
+    @classmethod
+    def train(cls, messages: Sequence[str], intents: Sequence[str],
+              n_features: int = N_FEATURES, **kwargs) -> "IntentClassifier":
+        from sklearn.feature_extraction.text import TfidfTransformer
+        from sklearn.linear_model import SGDClassifier
+
+        counts = hash_features(messages, n_features)
+        idf = TfidfTransformer(smooth_idf=True).fit(counts).idf_
+        model = SGDClassifier(loss="log_loss", alpha=1e-4, max_iter=50, tol=None, random_state=0)
+        model.fit(_tfidf(counts, idf), list(intents))
+
+        coef = np.atleast_2d(model.coef_).astype(np.float32)
+        intercept = np.atleast_1d(model.intercept_).astype(np.float32)
+        if len(model.classes_) == 2:  # binary models keep one row; make it two-class OvR
+            coef, intercept = np.vstack([-coef, coef]), np.concatenate([-intercept, intercept])
+        return cls(model.classes_, idf.astype(np.float32),
+                   sparse.csr_matrix(coef.T), intercept, **kwargs)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        w = self.weights.tocsr()
+        np.savez_compressed(path, classes=self.classes.astype(str), idf=self.idf,
+                            w_data=w.data, w_indices=w.indices, w_indptr=w.indptr,
+                            w_shape=np.asarray(w.shape), intercept=self.intercept)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as f:
+            weights = sparse.csr_matrix((f["w_data"], f["w_indices"], f["w_indptr"]),
+                                        shape=tuple(f["w_shape"]))
+            return cls(f["classes"], f["idf"], weights, f["intercept"], **kwargs)
+
+    def predict_with_confidence(self, messages: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Top intent and its probability per message, from one sparse batch pass."""
+        x = _tfidf(hash_features(messages, self.n_features), self.idf)
+        logits = np.asarray((x @ self.weights).todense()) + self.intercept
+        proba = 1.0 / (1.0 + np.exp(-logits))
+        proba /= proba.sum(axis=1, keepdims=True)
+        best = proba.argmax(axis=1)
+        return self.classes[best], proba[np.arange(len(best)), best]
+
+    def predict(self, messages: Sequence[str],
+                fallback: Optional[Callable[[List[str]], List[str]]] = None) -> List[str]:
+        messages = list(messages)
+        if not messages:
+            return []
+        labels, confidence = self.predict_with_confidence(messages)
+        intents = labels.tolist()
+        unsure = confidence < self.min_confidence
+        if self.greeting_max_words is not None:
+            # A long message that merely opens with "hi" is not a greeting
+            long_greetings = [intent == "greeting" and len(m.split()) > self.greeting_max_words
+                              for intent, m in zip(intents, messages)]
+            if fallback is None:
+                for i in np.flatnonzero(long_greetings):
+                    intents[i] = "default"
+            unsure |= np.asarray(long_greetings)
+        if fallback is not None:
+            unsure = np.flatnonzero(unsure)
+            if len(unsure):
+                for i, intent in zip(unsure, fallback([messages[i] for i in unsure])):
+                    intents[i] = intent
+        return intents
+
+
+def evaluate(messages: Sequence[str], intents: Sequence[str], labelled: Sequence[bool],
+             extra_messages: Sequence[str] = (), extra_intents: Sequence[str] = (),
+             folds: int = EVAL_FOLDS, seed: int = 0) -> Dict[str, Optional[float]]:
+    """
+    K-fold held-out scores: every message is predicted by a model trained without
+    it (extra examples are always in training), routed the way ChatEngine routes
+    (keyword fallback when unsure, greeting-length rule). Reports accuracy against
+    the training labels, accuracy on hand-labelled messages only, and agreement
+    with detect_intents.
+    """
+    from core.chat_engine import detect_intents
+
+    n = len(messages)
+    folds = max(2, min(folds, n))
+    order = np.random.default_rng(seed).permutation(n)
+    predicted: List[Optional[str]] = [None] * n
+    for fold in range(folds):
+        test = order[fold::folds]
+        test_set = set(test.tolist())
+        train_idx = [i for i in range(n) if i not in test_set]
+        model = IntentClassifier.train([messages[i] for i in train_idx] + list(extra_messages),
+                                       [intents[i] for i in train_idx] + list(extra_intents))
+        for i, intent in zip(test, model.predict([messages[i] for i in test], fallback=detect_intents)):
+            predicted[i] = intent
+
+    keyword = detect_intents(messages)
+    correct = [p == t for p, t in zip(predicted, intents)]
+    hand = [c for c, is_labelled in zip(correct, labelled) if is_labelled]
+    return {
+        "heldout_examples": n,
+        "heldout_accuracy": sum(correct) / n if n else None,
+        "heldout_labelled_accuracy": sum(hand) / len(hand) if hand else None,
+        "heldout_keyword_agreement": sum(p == k for p, k in zip(predicted, keyword)) / n if n else None,
+    }
+
+
+def train(out_path: str = DEFAULT_MODEL_PATH, extra_path: Optional[str] = None) -> Dict[str, float]:
+    from core.chat_engine import _INTENT_KEYWORDS, detect_intents
+
+    pairs = load_training_messages(extra_path)
+    messages = [m for m, _ in pairs]
+    weak = detect_intents(messages)
+    intents = [label or weak[i] for i, (_, label) in enumerate(pairs)]
+    labelled = [label is not None for _, label in pairs]
+    # Keyword lists double as short examples so every intent has coverage; they
+    # are always trained on and never scored
+    keyword_examples = [(w, intent) for intent, words in _INTENT_KEYWORDS.items() for w in words]
+    extra_messages = [w for w, _ in keyword_examples]
+    extra_intents = [intent for _, intent in keyword_examples]
+
+    scores = evaluate(messages, intents, labelled, extra_messages, extra_intents)
+    if not any(labelled):
+        print("Warning: no hand-labelled examples; every label comes from keyword matching, "
+              "so the model can only approximate detect_intents. Pass --data with labelled JSONL.")
+    print(f"Held-out accuracy {scores['heldout_accuracy']:.3f}, "
+          f"agreement with detect_intents {scores['heldout_keyword_agreement']:.3f} "
+          f"over {scores['heldout_examples']} messages")
+
+    start = time.perf_counter()
+    classifier = IntentClassifier.train(messages + extra_messages, intents + extra_intents)
+    classifier.save(out_path)
+    return {"examples": len(messages) + len(extra_messages), "keyword_labelled": len(messages) - sum(labelled),
+            "classes": len(classifier.classes), "train_seconds": time.perf_counter() - start, **scores}
+
+
+def bench(model_path: str, n: int = 200_000, batch_size: int = 4096) -> Dict[str, float]:
+    from scam_generator import SCAM_MESSAGES
+
+    start = time.perf_counter()
+    classifier = IntentClassifier.load(model_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    # Reference numbers make every message distinct
+    corpus = [f"{SCAM_MESSAGES[i % len(SCAM_MESSAGES)]} ref {i}" for i in range(n)]
+    start = time.perf_counter()
+    for i in range(0, n, batch_size):
+        classifier.predict_with_confidence(corpus[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    return {"load_ms": load_ms, "messages": n, "messages_per_sec": n / elapsed}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train or benchmark the intent classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train_cmd = sub.add_parser("train")
+    train_cmd.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    train_cmd.add_argument("--data", help="extra JSONL with message/intent records")
+    bench_cmd = sub.add_parser("bench")
+    bench_cmd.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    bench_cmd.add_argument("-n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        print(json.dumps(train(args.out, args.data), indent=2))
+    else:
+        print(json.dumps(bench(args.model, args.n), indent=2))
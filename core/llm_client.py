@@ -0,0 +1,256 @@
+"""
+core/llm_client.py - Pooled OpenAI-compatible chat client with an on-disk prompt cache
+
+LLMClient talks to any /v1/chat/completions endpoint (OpenAI, a local server,
+core/fake_llm_server.py) over one httpx.Client, so connections are kept alive
+and reused across calls and threads. Each client has its own key and base URL;
+nothing is set process-wide.
+
+PromptCache stores completions in SQLite keyed by the request (model, messages
+and sampling params). Sampled completions differ on every call, so like
+ReplyCache a key collects up to `variety` distinct completions before lookups
+start returning a random one of them.
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-3.5-turbo"
+REQUEST_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0
+MAX_CONNECTIONS = 32
+DEFAULT_CACHE_PATH = "llm_cache.db"
+CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 100_000
+
+# model -> tiktoken encoding, or None when it could not be loaded
+_ENCODINGS: Dict[str, Any] = {}
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """
+    tiktoken count for model. Without tiktoken, or without its BPE file (it is
+    downloaded on first use), falls back to ~4 characters per token.
+    """
+    if model not in _ENCODINGS:
+        try:
+            import tiktoken
+            _ENCODINGS[model] = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            print(f"tiktoken unavailable for {model}, estimating tokens from length: {e}")
+            _ENCODINGS[model] = None
+    encoding = _ENCODINGS[model]
+    if encoding is None:
+        return max(1, (len(text) + 3) // 4)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = DEFAULT_MODEL) -> int:
+    """Prompt tokens for a chat request: content plus ~4 tokens of framing per message."""
+    return sum(count_tokens(m["content"], model) + 4 for m in messages) + 3
+
+
+class LLMError(Exception):
+    """A failed completion; retryable for timeouts, connection errors, 429 and 5xx."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+class PromptCache:
+    """SQLite cache of request -> completions with a TTL and an entry cap (oldest used go first)."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = CACHE_TTL,
+                 max_entries: int = CACHE_MAX_ENTRIES, variety: int = 1,
+                 rng: Optional[random.Random] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.variety = variety
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT NOT NULL,
+                completion TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (key, completion)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def key(payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            if self.ttl_seconds is not None:
+                expired = self._conn.execute("DELETE FROM llm_cache WHERE key = ? AND created_at < ?",
+                                             (key, now - self.ttl_seconds)).rowcount
+                self._entries -= expired
+                self._counters["expired"] += expired
+            rows = self._conn.execute("SELECT completion FROM llm_cache WHERE key = ?", (key,)).fetchall()
+            if len(rows) < self.variety:
+                self._counters["misses"] += 1
+                self._conn.commit()
+                return None
+            completion = self.rng.choice(rows)[0]
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ? AND completion = ?",
+                               (now, key, completion))
+            self._conn.commit()
+            self._counters["hits"] += 1
+            return completion
+
+    def put(self, key: str, completion: str):
+        now = time.time()
+        with self._lock:
+            added = self._conn.execute(
+                "INSERT OR IGNORE INTO llm_cache (key, completion, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)", (key, completion, now, now)).rowcount
+            self._entries += added
+            if self._entries > self.max_entries:
+                # Trim an extra 10% so eviction doesn't run on every insert at the cap
+                excess = self._entries - int(self.max_entries * 0.9)
+                evicted = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE rowid IN "
+                    "(SELECT rowid FROM llm_cache ORDER BY last_used LIMIT ?)", (excess,)).rowcount
+                self._entries -= evicted
+                self._counters["evicted"] += evicted
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = self._entries
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+class LLMClient:
+    """Chat completions over a keep-alive httpx connection pool, with an optional PromptCache."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 model: str = DEFAULT_MODEL, timeout: float = REQUEST_TIMEOUT,
+                 connect_timeout: float = CONNECT_TIMEOUT, max_connections: int = MAX_CONNECTIONS,
+                 cache: Optional[PromptCache] = None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = (base_url or os.getenv("LLM_API_BASE") or DEFAULT_BASE_URL).rstrip("/")
+        self.model = model
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._http = httpx.Client(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "errors": 0, "cache_hits": 0,
+                          "prompt_tokens": 0, "completion_tokens": 0}
+        self._request_seconds = 0.0
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int = 100,
+                 temperature: float = 0.8, timeout: Optional[float] = None, **params) -> str:
+        """Text of the first choice; raises LLMError on failure. timeout overrides the client's."""
+        payload = {"model": params.pop("model", self.model), "messages": messages,
+                   "max_tokens": max_tokens, "temperature": temperature, **params}
+        cache_key = self.cache.key(payload) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                with self._lock:
+                    self._counters["cache_hits"] += 1
+                return cached
+
+        text = self._post(payload, timeout)
+        if cache_key is not None:
+            self.cache.put(cache_key, text)
+        return text
+
+    def _post(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        if not self.api_key and self.base_url == DEFAULT_BASE_URL:
+            raise LLMError("No API key provided (set OPENAI_API_KEY or pass api_key)")
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                response = self._http.post("/chat/completions", json=payload)
+            else:
+                response = self._http.post("/chat/completions", json=payload,
+                                           timeout=httpx.Timeout(timeout, connect=self.connect_timeout))
+        except httpx.TimeoutException as e:
+            self._record(start, error=True)
+            raise LLMError(f"LLM request timed out: {e}", retryable=True) from e
+        except httpx.TransportError as e:
+            self._record(start, error=True)
+            raise LLMError(f"LLM connection failed: {e}", retryable=True) from e
+        if response.status_code != 200:
+            self._record(start, error=True)
+            raise LLMError(f"LLM returned HTTP {response.status_code}: {response.text[:200]}",
+                           status=response.status_code,
+                           retryable=response.status_code == 429 or response.status_code >= 500)
+        try:
+            body = response.json()
+            text = body["choices"][0]["message"]["content"].strip()
+        except (ValueError, KeyError, IndexError, AttributeError) as e:
+            self._record(start, error=True)
+            raise LLMError(f"Unexpected LLM response: {response.text[:200]}") from e
+        self._record(start, usage=body.get("usage") or {})
+        return text
+
+    def _record(self, start: float, error: bool = False, usage: Optional[Dict[str, int]] = None):
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["errors"] += error
+            self._request_seconds += time.perf_counter() - start
+            if usage:
+                self._counters["prompt_tokens"] += usage.get("prompt_tokens", 0)
+                self._counters["completion_tokens"] += usage.get("completion_tokens", 0)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["mean_request_ms"] = (self._request_seconds / stats["requests"] * 1000
+                                        if stats["requests"] else 0.0)
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,68 @@
+"""
+core/migrations.py - Versioned schema migrations for the profiles database
+
+The schema version lives in SQLite's PRAGMA user_version. MIGRATIONS[i] takes a
+database from version i to i + 1; migrate() applies whatever is pending, each
+step in its own BEGIN IMMEDIATE transaction together with the version bump, so
+a failed step leaves the database at the previous version and concurrent
+processes can't apply the same step twice. Never edit a released migration;
+append a new one (and mirror the result in core/schema.sql).
+"""
+
+import sqlite3
+from typing import List, Tuple
+
+MIGRATIONS: List[Tuple[str, ...]] = [
+    # 1: the original table; databases created before versioning already have it
+    (
+        """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bio TEXT NOT NULL,
+            openness REAL,
+            conscientiousness REAL,
+            extraversion REAL,
+            agreeableness REAL,
+            neuroticism REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ),
+    # 2: keep trait, scam type, demographics and the consistency flag; index the
+    # trait / time and scam type filters analytics run
+    (
+        "ALTER TABLE profiles ADD COLUMN trait TEXT",
+        "ALTER TABLE profiles ADD COLUMN scam_type TEXT",
+        "ALTER TABLE profiles ADD COLUMN name TEXT",
+        "ALTER TABLE profiles ADD COLUMN age INTEGER",
+        "ALTER TABLE profiles ADD COLUMN location TEXT",
+        "ALTER TABLE profiles ADD COLUMN occupation TEXT",
+        "ALTER TABLE profiles ADD COLUMN interests TEXT",  # JSON array
+        "ALTER TABLE profiles ADD COLUMN consistency_ok INTEGER",  # 1 / 0, NULL when unchecked
+        "CREATE INDEX IF NOT EXISTS idx_profiles_trait_created ON profiles (trait, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_profiles_scam_type ON profiles (scam_type)",
+    ),
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: int = SCHEMA_VERSION) -> int:
+    """Bring conn's database up to target; returns the version it ends at."""
+    if schema_version(conn) > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema v{schema_version(conn)} is newer than this code "
+                           f"(v{SCHEMA_VERSION})")
+    while True:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Re-read under the write lock: another process may have just migrated
+            version = schema_version(conn)
+            if version >= target:
+                return version
+            for statement in MIGRATIONS[version]:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+        print(f"Migrated profiles database to schema v{version + 1}")
@@ -0,0 +1,217 @@
+"""
+core/model_backend.py - Fine-tuned DistilGPT-2 replies with dynamic micro-batching
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Generation defaults; replies are one short chat line
+MAX_NEW_TOKENS = 40
+MAX_BATCH_SIZE = 8
+MAX_WAIT_MS = 10.0
+REQUEST_TIMEOUT = 30.0
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single requests into batches for a batch function.
+
+    A worker thread takes the first queued item, then keeps collecting until either
+    max_batch_size items are waiting or max_wait_ms has passed since that first
+    item arrived, and runs batch_fn on the lot. Each caller gets a Future.
+    """
+
+    def __init__(self, batch_fn: Callable[[List], List], max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait_ms: float = MAX_WAIT_MS, name: str = "micro-batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._stats = {"requests": 0, "batches": 0, "errors": 0}
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                self._queue.put(None)  # let the outer loop see the shutdown marker
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            items = [item for item, _ in batch]
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                self._stats["errors"] += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        stats["mean_batch_size"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+
+def build_prompt(personality_scores: Dict[str, float], message: str) -> str:
+    """Same layout fine_tune_chat.py trains on, ending where the response starts."""
+    s = {k: personality_scores.get(k, 0.5) for k in
+         ("neuroticism", "agreeableness", "conscientiousness", "extraversion", "openness")}
+    return (
+        f"Personality: Neuroticism={s['neuroticism']:.2f}, "
+        f"Agreeableness={s['agreeableness']:.2f}, "
+        f"Conscientiousness={s['conscientiousness']:.2f}, "
+        f"Extraversion={s['extraversion']:.2f}, "
+        f"Openness={s['openness']:.2f}\n"
+        f"Message: {message}\n"
+        f"Response:"
+    )
+
+
+class ModelReplyBackend:
+    """
+    Serves the checkpoint written by fine_tune_chat.py on CPU.
+
+    The model is loaded on first use; concurrent generate() calls are grouped by a
+    MicroBatcher and run through model.generate together. If loading fails the
+    error is remembered and later calls fail fast, so callers can fall back.
+    """
+
+    def __init__(self, model_path: str, max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait_ms: float = MAX_WAIT_MS, max_new_tokens: int = MAX_NEW_TOKENS,
+                 timeout: float = REQUEST_TIMEOUT):
+        self.model_path = model_path
+        self.max_new_tokens = max_new_tokens
+        self.timeout = timeout
+        self._model = None
+        self._tokenizer = None
+        self._torch = None
+        self.load_error: Optional[Exception] = None
+        self._load_lock = threading.Lock()
+        self._batcher = MicroBatcher(self.generate_batch, max_batch_size, max_wait_ms,
+                                     name="chat-model-batcher")
+
+    @staticmethod
+    def available(model_path: Optional[str]) -> bool:
+        return bool(model_path) and os.path.isdir(model_path)
+
+    def _load(self):
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is not None:
+                return
+            if self.load_error is not None:
+                raise self.load_error
+            try:
+                import torch
+                from transformers import AutoModelForCausalLM, AutoTokenizer
+
+                tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+                tokenizer.pad_token = tokenizer.eos_token
+                tokenizer.padding_side = "left"  # decoder-only: pad before the prompt
+                model = AutoModelForCausalLM.from_pretrained(self.model_path)
+                model.to("cpu").eval()
+            except Exception as e:
+                self.load_error = e
+                raise
+            self._torch, self._tokenizer, self._model = torch, tokenizer, model
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """Generate one reply per prompt in a single forward pass batch."""
+        self._load()
+        inputs = self._tokenizer(prompts, return_tensors="pt", padding=True)
+        with self._torch.no_grad():
+            output = self._model.generate(
+                **inputs,
+                max_new_tokens=self.max_new_tokens,
+                do_sample=True,
+                top_p=0.9,
+                temperature=0.8,
+                pad_token_id=self._tokenizer.eos_token_id,
+            )
+        new_tokens = output[:, inputs["input_ids"].shape[1]:]
+        texts = self._tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+        # The model keeps going past the reply; keep the first line
+        return [text.strip().split("\n", 1)[0].strip() for text in texts]
+
+    def stream(self, personality_scores: Dict[str, float], message: str) -> Iterator[str]:
+        """
+        Yield reply text as tokens are produced, stopping at the end of the first line.
+        Streams bypass the micro-batcher: each one runs its own generate() call.
+        """
+        if self.load_error is not None:
+            raise self.load_error
+        self._load()
+        from transformers import TextIteratorStreamer
+
+        inputs = self._tokenizer([build_prompt(personality_scores, message)], return_tensors="pt")
+        streamer = TextIteratorStreamer(self._tokenizer, skip_prompt=True,
+                                        skip_special_tokens=True, timeout=self.timeout)
+
+        def run():
+            with self._torch.no_grad():
+                self._model.generate(**inputs, streamer=streamer,
+                                     max_new_tokens=self.max_new_tokens, do_sample=True,
+                                     top_p=0.9, temperature=0.8,
+                                     pad_token_id=self._tokenizer.eos_token_id)
+
+        threading.Thread(target=run, name="chat-model-stream", daemon=True).start()
+        started = False
+        for text in streamer:
+            if not started:
+                text = text.lstrip()
+                started = bool(text)
+            line, newline, _ = text.partition("\n")
+            if line:
+                yield line
+            if newline and started:
+                break  # the rest of the generation is discarded
+
+    def generate(self, personality_scores: Dict[str, float], message: str) -> str:
+        if self.load_error is not None:
+            raise self.load_error
+        future = self._batcher.submit(build_prompt(personality_scores, message))
+        return future.result(timeout=self.timeout)
+
+    def stats(self) -> Dict[str, float]:
+        return self._batcher.stats()
+
+    def close(self):
+        self._batcher.close()
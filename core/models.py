@@ -1,8 +1,20 @@
 #Data models
 
 
-from dataclasses import dataclass
-from typing import Dict
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Canonical Big Five column order for score vectors and matrices
+BIG_FIVE = ("openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism")
+
+# Scam conversations move through these stages; a session's stage never goes back
+ESCALATION_STAGES = ("rapport", "hook", "pressure", "extraction")
+_INTENT_STAGE = {"prize": 1, "urgent": 2, "money": 3}
+# Recent turns kept per session, and the longest text stored for one turn
+HISTORY_TURNS = 8
+MAX_TURN_CHARS = 500
 
 @dataclass
 class BaitProfile:
@@ -17,4 +29,42 @@ class BaitProfile:
             "personality": self.personality,
             "target_trait": self.target_trait,
             "scam_type": self.scam_type
-        }
\ No newline at end of file
+        }
+
+@dataclass
+class ConversationState:
+    """Per-session chat state held by ChatEngine's session store."""
+    # Last reply per "trait:intent" combo, to avoid immediate repeats
+    last_used: Dict[str, str] = field(default_factory=dict)
+    # Session-local random stream, derived from the engine seed and session id
+    rng: Optional[random.Random] = None
+    # Ring buffer of (sender, text, intent) for the last HISTORY_TURNS turns
+    turns: Deque[Tuple[str, str, str]] = field(
+        default_factory=lambda: deque(maxlen=HISTORY_TURNS))
+    # Running summary of the whole conversation, updated once per turn
+    intent_counts: Dict[str, int] = field(default_factory=dict)
+    escalation_stage: int = 0
+    turn_count: int = 0
+    # Sender -> core.personality_analyzer.IncrementalEstimator, filled in by ChatEngine
+    estimators: Dict[str, Any] = field(default_factory=dict)
+
+    def record(self, sender: str, text: str, intent: Optional[str] = None):
+        """Fold one turn into the state; constant time and memory however long the chat runs."""
+        self.turns.append((sender, text[:MAX_TURN_CHARS], intent or ""))
+        self.turn_count += 1
+        if intent:
+            self.intent_counts[intent] = self.intent_counts.get(intent, 0) + 1
+            self.escalation_stage = max(self.escalation_stage, _INTENT_STAGE.get(intent, 0))
+
+    def recent(self, n: Optional[int] = None) -> List[Dict[str, str]]:
+        turns = list(self.turns)[-n:] if n else list(self.turns)
+        return [{"sender": s, "text": t, "intent": i} for s, t, i in turns]
+
+    def summary(self) -> Dict:
+        return {
+            "turns": self.turn_count,
+            "intent_counts": dict(self.intent_counts),
+            "escalation_stage": ESCALATION_STAGES[self.escalation_stage],
+            "recent": self.recent(),
+            "personality": {sender: e.snapshot() for sender, e in self.estimators.items()},
+        }
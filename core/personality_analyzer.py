@@ -0,0 +1,272 @@
+"""
+core/personality_analyzer.py - Weighted-lexicon Big Five scoring for single texts and corpora
+"""
+
+import json
+import math
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from core.models import BIG_FIVE
+
+# Trait -> {word: weight}. A weight of 1.0 moves a neutral 0.5 score to 0.8 on its
+# own (the old fixed keyword bump); negative weights pull the score below 0.5.
+TRAIT_LEXICON: Dict[str, Dict[str, float]] = {
+    "neuroticism": {
+        "worry": 1.0, "worried": 1.0, "worries": 1.0, "worrying": 1.0,
+        "anxious": 1.0, "anxiety": 1.0, "stress": 1.0, "stressed": 1.0, "stressful": 0.8,
+        "nervous": 0.9, "scared": 0.8, "afraid": 0.8, "fear": 0.7, "panic": 0.9,
+        "panicking": 0.9, "overthink": 0.9, "overthinking": 0.9, "insecure": 0.8,
+        "upset": 0.6, "tense": 0.6, "edge": 0.4, "sad": 0.5, "freaking": 0.7,
+        "calm": -0.7, "relaxed": -0.8, "chill": -0.5, "confident": -0.6, "secure": -0.5,
+    },
+    "agreeableness": {
+        "help": 1.0, "helping": 1.0, "kind": 1.0, "kindness": 1.0, "trust": 1.0,
+        "trusting": 0.9, "nice": 0.6, "polite": 0.7, "sorry": 0.5, "please": 0.3,
+        "thank": 0.5, "thanks": 0.5, "grateful": 0.7, "care": 0.6, "caring": 0.7,
+        "friendly": 0.6, "happy": 0.3, "believe": 0.4, "support": 0.5, "together": 0.4,
+        "rude": -0.8, "hate": -0.8, "annoying": -0.6, "whatever": -0.3, "stupid": -0.7,
+    },
+    "conscientiousness": {
+        "plan": 0.7, "plans": 0.5, "planned": 0.7, "organized": 1.0, "schedule": 0.7,
+        "careful": 0.9, "carefully": 0.9, "responsible": 0.9, "deadline": 0.5,
+        "verify": 0.7, "confirm": 0.6, "proof": 0.6, "official": 0.5, "details": 0.4,
+        "prepared": 0.7, "goals": 0.6, "discipline": 0.9, "thorough": 0.9,
+        "forgot": -0.9, "oops": -0.8, "lazy": -1.0, "later": -0.4, "messy": -0.8,
+        "spontaneous": -0.7, "impulsive": -0.9, "eventually": -0.4, "procrastinate": -1.0,
+    },
+    "extraversion": {
+        "party": 1.0, "parties": 1.0, "social": 1.0, "fun": 1.0, "friends": 0.7,
+        "outgoing": 1.0, "energy": 0.6, "energetic": 0.9, "adventure": 0.6,
+        "hype": 0.7, "hyped": 0.7, "celebrate": 0.7, "crowd": 0.6, "people": 0.3,
+        "talk": 0.4, "chat": 0.4, "exciting": 0.5, "love": 0.3, "vibe": 0.5,
+        "quiet": -0.7, "alone": -0.7, "shy": -0.9, "introvert": -1.0, "home": -0.3,
+    },
+    "openness": {
+        "art": 1.0, "artist": 1.0, "creative": 1.0, "creativity": 1.0, "imagine": 1.0,
+        "imagination": 1.0, "curious": 0.8, "fascinating": 0.8, "philosophy": 0.9,
+        "explore": 0.7, "exploring": 0.7, "ideas": 0.6, "dream": 0.5, "dreams": 0.5,
+        "poetry": 0.8, "music": 0.4, "travel": 0.4, "new": 0.2, "novel": 0.6,
+        "consciousness": 0.8, "intrigued": 0.7, "perspective": 0.5, "mystery": 0.5,
+        "routine": -0.5, "boring": -0.4, "traditional": -0.5, "usual": -0.3,
+    },
+}
+
+# Chosen so a total weight of 1.0 maps to 0.5 + 0.5 * tanh(_GAIN) = 0.8
+_GAIN = math.atanh(0.6)
+_TOKEN_RE = re.compile(r"[a-z']+")
+# Messages an IncrementalEstimator queues with defer() before folding them in
+FOLD_EVERY = 32
+
+
+class PersonalityAnalyzer:
+    """
+    Compiles a trait lexicon into a sparse vocabulary x trait weight matrix and
+    scores documents as (document x vocabulary counts) @ weights, squashed into [0, 1].
+    """
+
+    def __init__(self, lexicon: Dict[str, Dict[str, float]] = None):
+        lexicon = lexicon or TRAIT_LEXICON
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, weights = [], [], []
+        for col, trait in enumerate(BIG_FIVE):
+            for word, weight in lexicon.get(trait, {}).items():
+                rows.append(self.vocabulary.setdefault(word, len(self.vocabulary)))
+                cols.append(col)
+                weights.append(weight)
+        self.weights = sparse.csr_matrix(
+            (np.asarray(weights, dtype=np.float64), (rows, cols)),
+            shape=(len(self.vocabulary), len(BIG_FIVE)),
+        )
+        # word -> ((trait column, weight), ...) for single-message updates, where a
+        # dict walk over a handful of tokens beats any NumPy call
+        terms: Dict[int, List[Tuple[int, float]]] = {}
+        for row, col, weight in zip(rows, cols, weights):
+            terms.setdefault(row, []).append((col, weight))
+        self._term_weights = {word: tuple(terms[i]) for word, i in self.vocabulary.items()}
+
+    def _term_counts(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        vocab = self.vocabulary
+        indices: List[int] = []
+        indptr = [0]
+        for text in texts:
+            indices.extend(vocab[t] for t in _TOKEN_RE.findall(text.lower()) if t in vocab)
+            indptr.append(len(indices))
+        # Repeated terms stay as duplicate entries; sparse matmul sums them
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(vocab)),
+        )
+
+    def raw_scores(self, texts: Iterable[str]) -> np.ndarray:
+        """Summed lexicon weights per text, before squashing; N x 5 in BIG_FIVE order."""
+        return np.asarray((self._term_counts(texts) @ self.weights).todense())
+
+    def score_texts(self, texts: Iterable[str]) -> np.ndarray:
+        """Big Five scores in [0, 1] for a batch of texts; N x 5 in BIG_FIVE order."""
+        return squash(self.raw_scores(texts))
+
+    def analyze(self, text: str) -> Dict[str, float]:
+        return dict(zip(BIG_FIVE, self.score_texts([text])[0].tolist()))
+
+    def message_stats(self, text: str) -> Tuple[List[float], List[int], int]:
+        """Raw weight sums, lexicon hits per trait and token count for one text."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        raw = [0.0] * len(BIG_FIVE)
+        hits = [0] * len(BIG_FIVE)
+        term_weights = self._term_weights
+        for token in tokens:
+            for col, weight in term_weights.get(token, ()):
+                if weight:
+                    raw[col] += weight
+                    hits[col] += 1
+        return raw, hits, len(tokens)
+
+    def stream_jsonl(self, path: str, field: str = "text",
+                     batch_size: int = 1024) -> Iterator[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Score a JSONL file line by line, yielding (record, scores) pairs.
+        Only batch_size records are held at once, so memory stays flat on any file size.
+        Records missing the field score as empty text.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            batch: List[Dict[str, Any]] = []
+            for line in f:
+                if not line.strip():
+                    continue
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    yield from self._score_records(batch, field)
+                    batch = []
+            if batch:
+                yield from self._score_records(batch, field)
+
+    def _score_records(self, records, field):
+        matrix = self.score_texts(str(r.get(field) or "") for r in records)
+        for record, row in zip(records, matrix.tolist()):
+            yield record, dict(zip(BIG_FIVE, row))
+
+
+class IncrementalEstimator:
+    """
+    Running Big Five estimate for one conversation participant.
+
+    Keeps only sufficient statistics: summed lexicon weights, lexicon hits per trait,
+    message/token counts and an exponential moving average of per-message scores.
+    update() costs O(message length); scores() equals analyze() on the concatenation
+    of every message seen so far, and recent_scores() tracks the latest messages.
+    Messages without terms for a trait leave that trait's moving average alone.
+
+    defer() only queues the text; queued messages are folded in, in order, when
+    any score is read or once fold_every are waiting, so chat turns whose
+    personality is never looked at cost next to nothing.
+    """
+
+    # to_bytes layout: totals, hits, ema (5 each) then messages, tokens
+    _STATE_SIZE = 3 * len(BIG_FIVE) + 2
+
+    def __init__(self, analyzer: Optional[PersonalityAnalyzer] = None, alpha: float = 0.3,
+                 fold_every: int = FOLD_EVERY):
+        self.analyzer = analyzer or PersonalityAnalyzer()
+        self.alpha = alpha
+        self.fold_every = fold_every
+        # Plain lists: per-message updates touch 5 numbers, too few for NumPy to pay off
+        self.totals = [0.0] * len(BIG_FIVE)
+        self.hits = [0] * len(BIG_FIVE)
+        self.ema = [0.5] * len(BIG_FIVE)
+        self.messages = 0
+        self.tokens = 0
+        self._pending: List[str] = []
+
+    def update(self, text: str) -> Dict[str, float]:
+        self._fold()
+        self._apply(text)
+        return self.recent_scores()
+
+    def defer(self, text: str):
+        self._pending.append(text)
+        if len(self._pending) >= self.fold_every:
+            self._fold()
+
+    def _fold(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            for text in pending:
+                self._apply(text)
+
+    def _apply(self, text: str):
+        raw, hits, tokens = self.analyzer.message_stats(text)
+        alpha, totals, ema, seen_hits = self.alpha, self.totals, self.ema, self.hits
+        for i, (weight, hit) in enumerate(zip(raw, hits)):
+            totals[i] += weight
+            if hit:
+                current = _squash1(weight)
+                # First evidence for a trait replaces the neutral prior instead of averaging with it
+                ema[i] = current if not seen_hits[i] else ema[i] + alpha * (current - ema[i])
+                seen_hits[i] += hit
+        self.messages += 1
+        self.tokens += tokens
+
+    def scores(self) -> Dict[str, float]:
+        self._fold()
+        return {trait: _squash1(total) for trait, total in zip(BIG_FIVE, self.totals)}
+
+    def recent_scores(self) -> Dict[str, float]:
+        self._fold()
+        return dict(zip(BIG_FIVE, self.ema))
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._fold()
+        return {"messages": self.messages, "tokens": self.tokens, "scores": self.scores(),
+                "recent_scores": self.recent_scores(),
+                "evidence": dict(zip(BIG_FIVE, self.hits))}
+
+    def to_bytes(self) -> bytes:
+        """68-byte float32 state, e.g. for storing next to a session row."""
+        self._fold()
+        state = np.array(self.totals + self.hits + self.ema + [self.messages, self.tokens])
+        return state.astype("<f4").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, analyzer: Optional[PersonalityAnalyzer] = None,
+                   alpha: float = 0.3) -> "IncrementalEstimator":
+        state = np.frombuffer(data, dtype="<f4").astype(np.float64).tolist()
+        if len(state) != cls._STATE_SIZE:
+            raise ValueError(f"Expected {cls._STATE_SIZE} values, got {len(state)}")
+        estimator = cls(analyzer, alpha)
+        n = len(BIG_FIVE)
+        estimator.totals = state[:n]
+        estimator.hits = [int(h) for h in state[n:2 * n]]
+        estimator.ema = state[2 * n:3 * n]
+        estimator.messages, estimator.tokens = int(state[-2]), int(state[-1])
+        return estimator
+
+
+def squash(raw: np.ndarray) -> np.ndarray:
+    """Map summed lexicon weights onto [0, 1], with 0 -> 0.5 (neutral)."""
+    return 0.5 + 0.5 * np.tanh(_GAIN * raw)
+
+
+def _squash1(raw: float) -> float:
+    """squash() for one number, without a NumPy round trip."""
+    return 0.5 + 0.5 * math.tanh(_GAIN * raw)
+
+
+# Score a JSONL corpus: python -m core.personality_analyzer profiles.jsonl --field bio
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Append Big Five scores to each JSONL record")
+    parser.add_argument("path")
+    parser.add_argument("--field", default="text")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    analyzer = PersonalityAnalyzer()
+    for record, scores in analyzer.stream_jsonl(args.path, args.field, args.batch_size):
+        record["analyzed_scores"] = scores
+        sys.stdout.write(json.dumps(record) + "\n")
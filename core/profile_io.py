@@ -0,0 +1,166 @@
+"""
+core/profile_io.py - Streaming JSONL profile files with compression and checkpoint/resume
+
+Profiles go one JSON object per line. Records are buffered and written in blocks
+of flush_every; for .gz / .zst paths every block is its own gzip member / zstd
+frame (both formats allow concatenation), so the file is valid after each flush.
+After a block is on disk the writer records the record count and byte offset in
+"<path>.ckpt". Resuming truncates the file back to that offset and carries on,
+so a crash loses at most the unflushed block. A checkpoint the file can't back
+(file missing or shorter than the offset) is dropped with a warning and the file
+starts over; a non-empty file with no checkpoint is never truncated.
+
+    with ProfileWriter("profiles.jsonl.gz", resume=True) as writer:
+        for profile in profiles[writer.records:]:
+            writer.write(profile)
+
+    for profile in read_profiles("profiles.jsonl.gz"):
+        ...
+"""
+
+import gzip
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+FLUSH_EVERY = 1000
+
+
+def _compression(path: str) -> str:
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Writing or reading .zst profile files needs the zstandard package") from e
+    return zstandard
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        return _zstd().ZstdCompressor(level=3).compress(data)
+    return data
+
+
+class ProfileWriter:
+    """Append-only JSONL writer with optional compression and a resumable checkpoint."""
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY, resume: bool = False):
+        self.path = path
+        self.checkpoint_path = path + ".ckpt"
+        self.flush_every = flush_every
+        self.compression = _compression(path)
+        self.records = 0  # records safely on disk
+        self._buffer = io.BytesIO()
+        self._buffered = 0
+
+        offset = 0
+        if resume:
+            self.records, offset = self._load_checkpoint()
+        self._file = open(path, "r+b" if offset else "wb")
+        # Drop whatever was written after the last checkpoint (a partial block)
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        if not offset:
+            self._save_checkpoint()
+
+    def _load_checkpoint(self) -> Tuple[int, int]:
+        """(records, offset) to resume from, after checking the checkpoint against the file."""
+        exists = os.path.exists(self.path)
+        if not os.path.exists(self.checkpoint_path):
+            if exists and os.path.getsize(self.path):
+                # Nothing says where its last complete block ends, so don't guess
+                raise FileExistsError(f"{self.path} has no checkpoint to resume from; "
+                                      f"remove it or write with resume=False")
+            return 0, 0
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            records, offset = int(checkpoint["records"]), int(checkpoint["offset"])
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Warning: unreadable checkpoint {self.checkpoint_path} ({e}); starting {self.path} over")
+            return 0, 0
+        if not exists or offset > os.path.getsize(self.path):
+            size = os.path.getsize(self.path) if exists else None
+            print(f"Warning: {self.path} is {'missing' if size is None else f'{size} bytes'} but its "
+                  f"checkpoint expects {offset} bytes ({records} records); starting it over")
+            return 0, 0
+        if checkpoint.get("compression", self.compression) != self.compression:
+            print(f"Warning: {self.path} was checkpointed as {checkpoint['compression']}, "
+                  f"not {self.compression}; starting it over")
+            return 0, 0
+        return records, offset
+
+    def write(self, profile: Dict[str, Any]):
+        self._buffer.write(json.dumps(profile, ensure_ascii=False).encode("utf-8"))
+        self._buffer.write(b"\n")
+        self._buffered += 1
+        if self._buffered >= self.flush_every:
+            self.flush()
+
+    def write_many(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for profile in profiles:
+            self.write(profile)
+            count += 1
+        return count
+
+    def flush(self):
+        """Write the buffered block, fsync it, then move the checkpoint past it."""
+        if not self._buffered:
+            return
+        self._file.write(_compress(self._buffer.getvalue(), self.compression))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records += self._buffered
+        self._buffer = io.BytesIO()
+        self._buffered = 0
+        self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"records": self.records, "offset": self._file.tell(),
+                       "compression": self.compression}, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "ProfileWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep the last checkpoint consistent; the unflushed block is redone on resume
+            self._file.close()
+
+
+def read_profiles(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield profiles one at a time from a JSONL file written by ProfileWriter (or by hand)."""
+    compression = _compression(path)
+    if compression == "gzip":
+        f = gzip.open(path, "rt", encoding="utf-8")
+    elif compression == "zstd":
+        raw = open(path, "rb")
+        reader = _zstd().ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        f = io.TextIOWrapper(reader, encoding="utf-8")
+    else:
+        f = open(path, "r", encoding="utf-8")
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
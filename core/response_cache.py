@@ -0,0 +1,97 @@
+"""
+core/response_cache.py - Reply cache for model-generated chat responses
+"""
+
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from core.models import BIG_FIVE
+from core.session_store import SessionStore
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_DIGIT_RE = re.compile(r"[0-9]+")
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, collapse punctuation/whitespace and mask numbers ($50 vs $500, ref ids)."""
+    text = _DIGIT_RE.sub("0", message.lower())
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+class ReplyCache:
+    """
+    Caches generated replies per (persona bucket, intent, normalized message).
+
+    Each key collects up to `variety` distinct replies: until it has that many,
+    lookups miss so the caller generates (and adds) another one; after that, lookups
+    return a random one of them. A key that keeps producing duplicates is treated as
+    full after 2 * variety adds. Entries expire ttl_seconds after they were first
+    filled, and the least recently used keys go once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 50_000, ttl_seconds: Optional[float] = 3600,
+                 variety: int = 3, quantum: float = 0.1,
+                 clock: Callable[[], float] = time.monotonic,
+                 rng: Optional[random.Random] = None):
+        self.ttl_seconds = ttl_seconds
+        self.variety = variety
+        self.quantum = quantum
+        self._clock = clock
+        # Entry is [filled_at, [replies], adds]; the store handles LRU and drops idle keys
+        self._store = SessionStore(lambda: [clock(), [], 0], max_sessions=max_entries,
+                                   ttl_seconds=ttl_seconds, clock=clock)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0}
+        self.rng = rng or random.Random()
+
+    def key(self, personality_scores: Dict[str, float], intent: str, message: str) -> Tuple:
+        bucket = tuple(int(round(personality_scores.get(t, 0.5) / self.quantum)) for t in BIG_FIVE)
+        digest = hashlib.blake2b(normalize_message(message).encode("utf-8"), digest_size=8).digest()
+        return bucket, intent, digest
+
+    def get(self, key: Tuple) -> Optional[str]:
+        entry = self._store.get(key)
+        with self._lock:
+            if self.ttl_seconds is not None and self._clock() - entry[0] >= self.ttl_seconds:
+                entry[0] = self._clock()
+                entry[1].clear()
+                entry[2] = 0
+                self._counters["expired"] += 1
+            if not self._is_full(entry):
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            return self.rng.choice(entry[1])
+
+    def add(self, key: Tuple, reply: str):
+        entry = self._store.get(key)
+        with self._lock:
+            replies = entry[1]
+            if not replies:
+                entry[0] = self._clock()
+            entry[2] += 1
+            if reply not in replies and len(replies) < self.variety:
+                replies.append(reply)
+
+    def _is_full(self, entry) -> bool:
+        replies, adds = entry[1], entry[2]
+        return bool(replies) and (len(replies) >= self.variety or adds >= 2 * self.variety)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, float]:
+        store = self._store.stats()
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = store["sessions"]
+        stats["max_entries"] = store["max_sessions"]
+        stats["evicted_lru"] = store["evicted_lru"]
+        stats["evicted_idle"] = store["evicted_idle"]
+        return stats
@@ -1,3 +1,5 @@
+-- Current profiles schema (v2). Generated by the migrations in core/migrations.py,
+-- which are what actually create and upgrade databases; keep this file in sync.
 CREATE TABLE IF NOT EXISTS profiles (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     bio TEXT NOT NULL,
@@ -6,5 +8,16 @@ CREATE TABLE IF NOT EXISTS profiles (
     extraversion REAL,
     agreeableness REAL,
     neuroticism REAL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    trait TEXT,
+    scam_type TEXT,
+    name TEXT,
+    age INTEGER,
+    location TEXT,
+    occupation TEXT,
+    interests TEXT,         -- JSON array
+    consistency_ok INTEGER  -- 1 / 0, NULL when unchecked
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_trait_created ON profiles (trait, created_at);
+CREATE INDEX IF NOT EXISTS idx_profiles_scam_type ON profiles (scam_type);
+PRAGMA user_version = 2;
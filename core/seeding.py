@@ -0,0 +1,40 @@
+"""
+core/seeding.py - Reproducible random streams for engines, sessions and benchmarks
+"""
+
+import hashlib
+import os
+import random
+from typing import Optional
+
+import numpy as np
+
+# Process-wide default seed; set JANUS_SEED (or call set_global_seed) to make every
+# engine created without an explicit seed deterministic
+GLOBAL_SEED: Optional[int] = int(os.environ["JANUS_SEED"]) if os.getenv("JANUS_SEED") else None
+
+
+def set_global_seed(seed: Optional[int]):
+    global GLOBAL_SEED
+    GLOBAL_SEED = seed
+
+
+def derive_seed(seed: int, *labels) -> int:
+    """Stable 64-bit sub-seed for a named stream, e.g. derive_seed(42, "session", "abc")."""
+    material = ":".join([str(seed)] + [str(label) for label in labels]).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big")
+
+
+def resolve_seed(seed: Optional[int]) -> Optional[int]:
+    return GLOBAL_SEED if seed is None else seed
+
+
+def make_rng(seed: Optional[int] = None, *labels) -> random.Random:
+    """random.Random for one stream; unseeded (OS entropy) when no seed is configured."""
+    seed = resolve_seed(seed)
+    return random.Random() if seed is None else random.Random(derive_seed(seed, *labels))
+
+
+def make_np_rng(seed: Optional[int] = None, *labels) -> np.random.Generator:
+    seed = resolve_seed(seed)
+    return np.random.default_rng(None if seed is None else derive_seed(seed, *labels))
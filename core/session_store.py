@@ -0,0 +1,101 @@
+"""
+core/session_store.py - Thread-safe, bounded per-conversation state
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SessionStore:
+    """
+    LRU + idle-TTL map from conversation id to a state object.
+
+    The least recently used session is evicted once max_sessions is reached, and
+    sessions untouched for ttl_seconds are dropped on the next access, so memory
+    stays flat no matter how many conversations pass through. A single lock guards
+    the map; how often callers had to wait for it is tracked in stats().
+    """
+
+    def __init__(self, factory: Callable[[], Any] = dict, max_sessions: int = 10_000,
+                 ttl_seconds: Optional[float] = 1800, clock: Callable[[], float] = time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._sessions: "OrderedDict[Hashable, list]" = OrderedDict()  # id -> [state, last_seen]
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "created": 0, "evicted_lru": 0, "evicted_idle": 0,
+                          "lock_acquisitions": 0, "lock_contended": 0}
+        self._lock_wait = 0.0
+
+    @contextmanager
+    def _locked(self):
+        if not self._lock.acquire(blocking=False):
+            start = time.perf_counter()
+            self._lock.acquire()
+            self._lock_wait += time.perf_counter() - start
+            self._counters["lock_contended"] += 1
+        try:
+            self._counters["lock_acquisitions"] += 1
+            yield
+        finally:
+            self._lock.release()
+
+    def _evict_idle(self, now: float):
+        # Oldest entries sit at the front, so stop at the first one still alive
+        if self.ttl_seconds is None:
+            return
+        while self._sessions:
+            session_id, (_, last_seen) = next(iter(self._sessions.items()))
+            if now - last_seen < self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            self._counters["evicted_idle"] += 1
+
+    def get(self, session_id: Hashable) -> Any:
+        """Return the state for session_id, creating it if missing or expired."""
+        with self._locked():
+            now = self._clock()
+            self._evict_idle(now)
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+                self._counters["hits"] += 1
+                return entry[0]
+
+            if len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._counters["evicted_lru"] += 1
+            state = self.factory()
+            self._sessions[session_id] = [state, now]
+            self._counters["created"] += 1
+            return state
+
+    def peek(self, session_id: Hashable) -> Any:
+        """Return the state for session_id without creating it or refreshing its age."""
+        with self._locked():
+            entry = self._sessions.get(session_id)
+            return entry[0] if entry is not None else None
+
+    def discard(self, session_id: Hashable) -> bool:
+        with self._locked():
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._locked():
+            stats = dict(self._counters)
+            stats["sessions"] = len(self._sessions)
+            stats["max_sessions"] = self.max_sessions
+            stats["lock_wait_seconds"] = round(self._lock_wait, 6)
+            acquisitions = stats["lock_acquisitions"]
+            stats["lock_contention_rate"] = stats["lock_contended"] / acquisitions if acquisitions else 0.0
+            return stats
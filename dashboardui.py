@@ -7,6 +7,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 import plotly.graph_objects as go
 import time
+import uuid
 import sys, os
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -25,7 +26,16 @@ init_db()
 logger = get_logger()
 limiter = RateLimiter(max_requests=20, window_seconds=60)
 bait_gen = BaitGenerator()
-chat_engine = ChatEngine()
+
+
+@st.cache_resource
+def get_chat_engine() -> ChatEngine:
+    # Streamlit reruns this script on every interaction; one engine per server
+    # keeps each browser's session (keyed by chat_session_id) across reruns
+    return ChatEngine()
+
+
+chat_engine = get_chat_engine()
 
 TRAITS = [
     "high_neuroticism",
@@ -207,11 +217,19 @@ for key, default in {
     "total_messages": 0,
     "safety_blocks": 0,
     "input_key": 0,
+    "chat_session_id": None,
 }.items():
     if key not in st.session_state:
         st.session_state[key] = default
+if st.session_state.chat_session_id is None:
+    st.session_state.chat_session_id = uuid.uuid4().hex
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
+def new_chat_session():
+    """Start a fresh conversation id so the chat engine forgets the old one."""
+    chat_engine.end_session(st.session_state.chat_session_id)
+    st.session_state.chat_session_id = uuid.uuid4().hex
+
 def ts():
     return time.strftime("%H:%M")
 
@@ -309,6 +327,7 @@ with left:
                 st.session_state.profile = profile
                 st.session_state.trait = trait
                 st.session_state.chat_history = []
+                new_chat_session()
                 st.session_state.total_sessions += 1
                 logger.info(f"Profile generated | trait={trait}")
 
@@ -322,7 +341,12 @@ with left:
                         "extraversion": scores.get("extraversion", 0.5),
                         "agreeableness": scores.get("agreeableness", 0.5),
                         "neuroticism": scores.get("neuroticism", 0.5),
-                    }
+                    },
+                    "trait": profile.get("trait", trait),
+                    "demographics": profile.get("demographics", {}),
+                    # Scams are picked later in the chat, so this is usually unset here
+                    "scam_type": profile.get("scam_type"),
+                    "consistency_check": profile.get("consistency_check"),
                 })
 
     if st.session_state.profile:
@@ -493,7 +517,8 @@ with mid:
                     logger.info(f"Scammer msg | {user_msg[:60]}")
 
                     scores = st.session_state.profile.get("personality_scores", {})
-                    reply = chat_engine.generate_chat_response(scores, user_msg)
+                    reply = chat_engine.generate_chat_response(
+                        scores, user_msg, session_id=st.session_state.chat_session_id)
 
                     st.session_state.chat_history.append(
                         {"sender": name, "text": reply}
@@ -527,7 +552,8 @@ with mid:
                         msg = tpl["message"]
 
                     scores = st.session_state.profile.get("personality_scores", {})
-                    reply = chat_engine.generate_chat_response(scores, msg)
+                    reply = chat_engine.generate_chat_response(
+                        scores, msg, session_id=st.session_state.chat_session_id)
 
                     st.session_state.chat_history.append(
                         {"sender": "Scammer", "text": msg}
@@ -593,10 +619,12 @@ with right:
 
     if st.button("🗑 Clear Chat", use_container_width=True):
         st.session_state.chat_history = []
+        new_chat_session()
         st.rerun()
 
     if st.button("🔄 New Session", use_container_width=True):
         st.session_state.chat_history = []
+        new_chat_session()
         st.session_state.profile = None
         st.rerun()
 
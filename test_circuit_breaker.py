@@ -0,0 +1,156 @@
+"""
+test_circuit_breaker.py - Closed / open / half-open transitions of CircuitBreaker
+"""
+
+import pytest
+
+from core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def ok():
+    return "ok"
+
+
+def fail():
+    raise RuntimeError("boom")
+
+
+def slow(clock, seconds):
+    def call():
+        clock.now += seconds
+        return "late"
+    return call
+
+
+def make(clock, **kwargs):
+    options = dict(window=10, min_calls=4, failure_rate=0.5, slow_call_seconds=1.0,
+                   open_seconds=30.0, half_open_calls=1, clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_opens_at_failure_rate_after_min_calls():
+    clock = Clock()
+    breaker = make(clock)
+    breaker.call(ok)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    breaker.call(ok)
+    # 1 bad in 3: under min_calls and under the rate
+    assert breaker.state == CLOSED
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    # 2 bad in 4 reaches failure_rate once min_calls are in the window
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(ok)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_failures_below_min_calls_keep_it_closed():
+    clock = Clock()
+    breaker = make(clock)
+    for _ in range(breaker.min_calls - 1):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_bad():
+    clock = Clock()
+    breaker = make(clock)
+    for _ in range(4):
+        assert breaker.call(slow(clock, 2.0)) == "late"
+    assert breaker.state == OPEN
+    stats = breaker.stats()
+    assert stats["slow_calls"] == 4 and stats["failures"] == 0
+
+
+def test_call_within_uses_its_own_slow_threshold():
+    clock = Clock()
+    breaker = make(clock)
+    for _ in range(4):
+        breaker.call_within(5.0, slow(clock, 2.0))
+    assert breaker.state == CLOSED
+    assert breaker.stats()["slow_calls"] == 0
+
+
+def test_half_open_trial_limit_holds():
+    clock = Clock()
+    breaker = make(clock, half_open_calls=2)
+    trip(breaker)
+    clock.now += 30.0
+    assert breaker.state == HALF_OPEN
+
+    # Two trials may be in flight at once; a third is rejected until they finish
+    trials = []
+
+    def hold():
+        trials.append(breaker.state)
+        if len(trials) == 1:
+            breaker.call(hold)
+        else:
+            with pytest.raises(CircuitOpenError):
+                breaker.call(ok)
+        return "ok"
+
+    breaker.call(hold)
+    assert trials == [HALF_OPEN, HALF_OPEN]
+    assert breaker.state == CLOSED
+
+
+def test_closes_after_passing_trial():
+    clock = Clock()
+    breaker = make(clock)
+    trip(breaker)
+    clock.now += 29.0
+    with pytest.raises(CircuitOpenError):
+        breaker.call(ok)
+    clock.now += 1.0
+    assert breaker.call(ok) == "ok"
+    assert breaker.state == CLOSED
+    # A fresh window: one failure doesn't reopen it
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_reopens_after_failing_trial():
+    clock = Clock()
+    breaker = make(clock)
+    trip(breaker)
+    clock.now += 30.0
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(ok)
+    # open_seconds restart from the failed trial
+    clock.now += 30.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.stats()["transitions"] == {"closed->open": 1, "open->half_open": 2,
+                                              "half_open->open": 1}
+
+
+def test_slow_trial_reopens():
+    clock = Clock()
+    breaker = make(clock)
+    trip(breaker)
+    clock.now += 30.0
+    breaker.call(slow(clock, 2.0))
+    assert breaker.state == OPEN
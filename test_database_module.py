@@ -0,0 +1,53 @@
+"""
+test_database_module.py - Per-thread SQLite connections in core.database_module
+"""
+
+import gc
+import sqlite3
+import threading
+
+import pytest
+
+from core import database_module
+from core.migrations import migrate
+
+PROFILE = {"bio": "Coffee first, then everything else.",
+           "personality": {"openness": 0.5, "conscientiousness": 0.5, "extraversion": 0.5,
+                           "agreeableness": 0.5, "neuroticism": 0.5}}
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "profiles.db")
+    monkeypatch.setattr(database_module, "DB_NAME", path)
+    yield path
+    database_module.close_connections()
+
+
+def test_short_lived_threads_do_not_keep_connections(db_path):
+    database_module.init_db()
+    for _ in range(50):
+        thread = threading.Thread(target=database_module.save_profile, args=(PROFILE,))
+        thread.start()
+        thread.join()
+    gc.collect()
+    # Only this thread's connection is left
+    assert len(database_module._connections) == 1
+    count = database_module.get_connection().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+    assert count == 50
+
+
+def test_failed_migration_is_retried(db_path, monkeypatch):
+    calls = []
+
+    def locked_once(conn):
+        calls.append(conn)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return migrate(conn)
+
+    monkeypatch.setattr(database_module, "migrate", locked_once)
+    with pytest.raises(sqlite3.OperationalError):
+        database_module.get_connection()
+    assert database_module.save_profile(PROFILE)
+    assert len(calls) == 2
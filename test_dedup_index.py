@@ -0,0 +1,74 @@
+"""
+test_dedup_index.py - Recall of the bio near-duplicate index at its threshold
+"""
+
+import random
+
+import numpy as np
+
+from core.dedup_index import THRESHOLD, BioDedupIndex, candidate_probability, choose_bands, shingles
+
+WORDS = ("coffee hiking tacos travel music dogs books sunsets yoga friends family beach "
+         "movies cooking art dancing wine running gaming photography nature concerts").split()
+
+
+def jaccard(a, b):
+    sa, sb = shingles(a), shingles(b)
+    return len(np.intersect1d(sa, sb)) / len(np.union1d(sa, sb))
+
+
+def near_duplicate_pairs(n, low, high, seed=7):
+    """n (bio, edited bio, Jaccard) triples whose true shingle Jaccard is in [low, high)."""
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < n:
+        words = [rng.choice(WORDS) + str(rng.randrange(100)) for _ in range(40)]
+        edited = list(words)
+        for _ in range(rng.randint(1, 3)):
+            edited[rng.randrange(len(edited))] = rng.choice(WORDS)
+        a, b = " ".join(words), " ".join(edited)
+        similarity = jaccard(a, b)
+        if low <= similarity < high:
+            pairs.append((a, b, similarity))
+    return pairs
+
+
+def test_choose_bands_recall_at_threshold():
+    bands, rows = choose_bands(128, THRESHOLD)
+    assert bands * rows == 128
+    assert candidate_probability(THRESHOLD, bands, rows) >= 0.9
+    # Dissimilar bios should still rarely be compared
+    assert candidate_probability(0.3, bands, rows) < 0.01
+
+
+def test_recall_above_threshold(tmp_path):
+    index = BioDedupIndex(str(tmp_path / "dedup.db"))
+    pairs = near_duplicate_pairs(300, THRESHOLD, 1.0)
+
+    # LSH stage: pairs at or above the threshold must share a band
+    shared = [bool(set(index.band_keys(index.signature(a))) & set(index.band_keys(index.signature(b))))
+              for a, b, _ in pairs]
+    assert np.mean(shared) >= 0.95
+
+    # End to end; the 128-hash estimate is +-0.035 around the true Jaccard, so
+    # pairs right at the threshold are a coin flip and are left out here
+    index.add_many((a, None) for a, _, _ in pairs)
+    clear = [(a, b) for a, b, similarity in pairs if similarity >= THRESHOLD + 0.05]
+    assert len(clear) >= 50
+    found = [index.query(b) is not None for _, b in clear]
+    assert np.mean(found) >= 0.95
+    index.close()
+
+
+def test_reopen_with_old_banding_rebuilds_bands(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    index = BioDedupIndex(path)
+    index.add("coffee first then everything else weekend hiker and taco critic")
+    index._conn.executemany("UPDATE bio_lsh_meta SET value = ? WHERE key = ?", [("8", "bands"), ("16", "rows")])
+    index._conn.execute("DELETE FROM bio_lsh")
+    index._conn.commit()
+    index.close()
+
+    reopened = BioDedupIndex(path)
+    assert reopened.query("coffee first then everything else weekend hiker and taco critic!") is not None
+    reopened.close()
@@ -0,0 +1,84 @@
+"""
+test_migrations.py - Upgrading profiles databases with core.migrations
+"""
+
+import sqlite3
+
+import pytest
+
+from core.migrations import MIGRATIONS, SCHEMA_VERSION, migrate, schema_version
+
+# The profiles table as databases created before schema versioning have it
+LEGACY_TABLE = """
+    CREATE TABLE profiles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bio TEXT NOT NULL,
+        openness REAL,
+        conscientiousness REAL,
+        extraversion REAL,
+        agreeableness REAL,
+        neuroticism REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def legacy_db(path, version=0):
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_TABLE)
+    conn.executemany("INSERT INTO profiles (bio, openness, conscientiousness, extraversion, "
+                     "agreeableness, neuroticism) VALUES (?, ?, ?, ?, ?, ?)",
+                     [("First bio", 0.1, 0.2, 0.3, 0.4, 0.5), ("Second bio", 0.5, 0.4, 0.3, 0.2, 0.1)])
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+    return conn
+
+
+def columns(conn):
+    return [row[1] for row in conn.execute("PRAGMA table_info(profiles)")]
+
+
+@pytest.mark.parametrize("version", [0, 1])
+def test_legacy_database_upgrades_and_keeps_rows(tmp_path, version):
+    conn = legacy_db(str(tmp_path / "profiles.db"), version)
+    assert migrate(conn) == SCHEMA_VERSION == 2
+    assert schema_version(conn) == 2
+
+    assert columns(conn)[-8:] == ["trait", "scam_type", "name", "age", "location", "occupation",
+                                  "interests", "consistency_ok"]
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(profiles)")}
+    assert {"idx_profiles_trait_created", "idx_profiles_scam_type"} <= indexes
+    rows = conn.execute("SELECT id, bio, openness, neuroticism, trait FROM profiles ORDER BY id").fetchall()
+    assert rows == [(1, "First bio", 0.1, 0.5, None), (2, "Second bio", 0.5, 0.1, None)]
+
+
+def test_empty_database_is_created_at_latest_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "profiles.db"))
+    assert migrate(conn) == SCHEMA_VERSION
+    assert "consistency_ok" in columns(conn)
+
+
+def test_second_migrate_is_a_no_op(tmp_path, capsys):
+    conn = legacy_db(str(tmp_path / "profiles.db"))
+    migrate(conn)
+    capsys.readouterr()
+    before = conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+
+    assert migrate(conn) == SCHEMA_VERSION
+    assert capsys.readouterr().out == ""
+    assert conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall() == before
+    assert conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] == 2
+
+
+def test_partial_target_stops_there(tmp_path):
+    conn = legacy_db(str(tmp_path / "profiles.db"))
+    assert migrate(conn, target=1) == 1
+    assert "trait" not in columns(conn)
+    assert migrate(conn) == len(MIGRATIONS)
+
+
+def test_newer_database_raises(tmp_path):
+    conn = legacy_db(str(tmp_path / "profiles.db"), version=SCHEMA_VERSION + 1)
+    with pytest.raises(RuntimeError, match="newer than this code"):
+        migrate(conn)
+    assert schema_version(conn) == SCHEMA_VERSION + 1
@@ -0,0 +1,79 @@
+"""
+test_profile_io.py - ProfileWriter checkpoint / resume paths
+"""
+
+import json
+import os
+
+import pytest
+
+from core.profile_io import ProfileWriter, read_profiles
+
+
+def profiles(start, stop):
+    return [{"id": i, "bio": f"bio {i}"} for i in range(start, stop)]
+
+
+def write(path, records, flush_every=2, resume=False):
+    with ProfileWriter(path, flush_every=flush_every, resume=resume) as writer:
+        writer.write_many(records)
+    return writer
+
+
+@pytest.mark.parametrize("name", ["profiles.jsonl", "profiles.jsonl.gz"])
+def test_resume_drops_the_unflushed_block(tmp_path, name):
+    path = str(tmp_path / name)
+    with pytest.raises(RuntimeError):
+        with ProfileWriter(path, flush_every=2) as writer:
+            for profile in profiles(0, 5):
+                writer.write(profile)
+            writer._file.write(b"partial block")  # crash mid-write
+            raise RuntimeError("crash")
+
+    with ProfileWriter(path, flush_every=2, resume=True) as writer:
+        assert writer.records == 4
+        writer.write_many(profiles(4, 6))
+    assert [p["id"] for p in read_profiles(path)] == list(range(6))
+
+
+def test_resume_with_missing_data_file_starts_over(tmp_path, capsys):
+    path = str(tmp_path / "profiles.jsonl")
+    write(path, profiles(0, 4))
+    os.remove(path)
+
+    writer = write(path, profiles(0, 2), resume=True)
+    assert writer.records == 2
+    assert "missing" in capsys.readouterr().out
+    assert [p["id"] for p in read_profiles(path)] == [0, 1]
+    with open(path, "rb") as f:
+        assert b"\0" not in f.read()
+
+
+def test_resume_with_short_data_file_starts_over(tmp_path, capsys):
+    path = str(tmp_path / "profiles.jsonl")
+    write(path, profiles(0, 4))
+    with open(path, "r+b") as f:
+        f.truncate(10)
+
+    writer = write(path, profiles(0, 2), resume=True)
+    assert writer.records == 2
+    assert "starting it over" in capsys.readouterr().out
+    assert [p["id"] for p in read_profiles(path)] == [0, 1]
+
+
+def test_resume_without_checkpoint_keeps_existing_file(tmp_path):
+    path = str(tmp_path / "profiles.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": 0}) + "\n")
+
+    with pytest.raises(FileExistsError):
+        ProfileWriter(path, resume=True)
+    assert [p["id"] for p in read_profiles(path)] == [0]
+
+
+def test_resume_without_any_file_starts_fresh(tmp_path):
+    path = str(tmp_path / "profiles.jsonl")
+    writer = write(path, profiles(0, 3), resume=True)
+    assert writer.records == 3
+    with open(path + ".ckpt", encoding="utf-8") as f:
+        assert json.load(f) == {"records": 3, "offset": os.path.getsize(path), "compression": "none"}